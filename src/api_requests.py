@@ -6,40 +6,391 @@ Célja, hogy leegyszerűsítse az API hívásokat a tesztek számára.
 """
 
 import requests # HTTP kérések küldésére
+import codecs
+import json
 import os
+import re
+import zlib
+from urllib.parse import urlsplit
 from dotenv import load_dotenv # környezeti változók (.env fájl) betöltésére
 
 load_dotenv()
 API_KEY = os.getenv("TMDB_API_KEY") # API kulcs beolvasása a környezeti változókból
 BASE_URL = "https://api.themoviedb.org/3"
 
-def get_popular_movies(page=1, language="en-US"):
-    """Népszerű filmek lekérdezése"""
+# Közös HTTP session: a kapcsolatokat (keep-alive) újrahasznosítja a kérések között,
+# így nem nyílik új socket minden hívásnál, és a pool mérete a soak tesztben mérhető
+SESSION = requests.Session()
+
+# Kérés megfigyelők: minden válasz után meghívódnak egy rekorddal
+# (endpoint, method, status, elapsed, bytes, wire_bytes) - ezt használja a metrika exporter.
+# Streamelt válasznál a bytes/wire_bytes csak a törzs végigolvasása után (iter_body) töltődik ki.
+_request_listeners = []
+
+def add_request_listener(callback):
+    """Megfigyelő regisztrálása: callback(record) minden válasz után"""
+    _request_listeners.append(callback)
+
+def remove_request_listener(callback):
+    """Megfigyelő eltávolítása"""
+    _request_listeners.remove(callback)
+
+def endpoint_label(url):
+    """Endpoint név metrikákhoz: az API útvonal, az ID-k helyén {id} (pl. /movie/{id})"""
+    path = urlsplit(url).path
+    base_path = urlsplit(BASE_URL).path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    return re.sub(r"/-?\d+(?=/|$)", "/{id}", path) or "/"
+
+def _notify_request_listeners(response, *args, **kwargs):
+    """Session response hook: rekord összeállítása a megfigyelőknek"""
+    if not _request_listeners:
+        return
+    # Streamelt törzs mérete itt még nem ismert (lásd measure_body);
+    # különben a requests amúgy is beolvasná a törzset
+    size = None if kwargs.get("stream") else len(response.content)
+    record = {
+        "endpoint": endpoint_label(response.url),
+        "method": response.request.method,
+        "status": response.status_code,
+        "elapsed": response.elapsed.total_seconds(),
+        "bytes": size,
+        "wire_bytes": None,
+    }
+    if kwargs.get("stream"):
+        # Az iter_body a törzs végigolvasása után ebbe a rekordba írja a méreteket
+        response.request_record = record
+    for callback in list(_request_listeners):
+        callback(record)
+
+SESSION.hooks["response"].append(_notify_request_listeners)
+
+# Streaming módban ekkora darabokban olvassuk a választ
+CHUNK_SIZE = 64 * 1024
+
+def get_popular_movies(page=1, language="en-US", stream=False, timeout=None):
+    """
+    Népszerű filmek lekérdezése
+
+    Mint minden kérés függvénynél: stream=True esetén a törzs nem töltődik be
+    előre, a timeout (másodperc) a requests timeout-ja (alapból nincs).
+    """
     url = f"{BASE_URL}/movie/popular"
     params = {"api_key": API_KEY, "page": page, "language": language}
-    return requests.get(url, params=params)
+    return SESSION.get(url, params=params, stream=stream, timeout=timeout)
 
-def get_movie_details(movie_id):
+def get_movie_details(movie_id, stream=False, timeout=None):
     """Film részletek lekérdezése ID alapján"""
     url = f"{BASE_URL}/movie/{movie_id}"
     params = {"api_key": API_KEY}
-    return requests.get(url, params=params)
+    return SESSION.get(url, params=params, stream=stream, timeout=timeout)
 
-def search_movie(query, page=1):
+def search_movie(query, page=1, stream=False, timeout=None):
     """Film keresése név alapján"""
     url = f"{BASE_URL}/search/movie"
     params = {"api_key": API_KEY, "query": query, "page": page}
-    return requests.get(url, params=params)
+    return SESSION.get(url, params=params, stream=stream, timeout=timeout)
 
-def get_movie_genres():
+def get_movie_genres(stream=False, timeout=None):
     """Filmműfajok listájának lekérdezése"""
     url = f"{BASE_URL}/genre/movie/list"
     params = {"api_key": API_KEY}
-    return requests.get(url, params=params)
+    return SESSION.get(url, params=params, stream=stream, timeout=timeout)
 
-def get_with_custom_key(endpoint, api_key=None, **params):
+def get_with_custom_key(endpoint, api_key=None, stream=False, timeout=None, **params):
     """Egyedi API kulccsal való hívás (hibás kulcs teszteléshez)"""
     url = f"{BASE_URL}/{endpoint}"
     if api_key:
         params["api_key"] = api_key
-    return requests.get(url, params=params)
\ No newline at end of file
+    return SESSION.get(url, params=params, stream=stream, timeout=timeout)
+
+# --Streaming válaszkezelés--
+# stream=True-val kért válaszokhoz: a törzset darabonként olvassuk,
+# így a méret mérése és a "results" feldolgozása nem tartja memóriában az egészet
+
+class ResponseTooLarge(Exception):
+    """A válasz törzse túllépte a megengedett méretet, az olvasás megszakadt"""
+
+def _content_decompressor(response):
+    """
+    zlib kicsomagoló a Content-Encoding alapján
+
+    Returns:
+        kicsomagoló objektum gzip/deflate esetén, None ha nincs tömörítés,
+        False ha a kódolást nem ismerjük (ekkor a urllib3 dekódol)
+    """
+    encoding = response.headers.get("Content-Encoding", "").strip().lower()
+    if encoding in ("", "identity"):
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        # MAX_WBITS | 32: a gzip és a zlib fejlécet is felismeri
+        return zlib.decompressobj(zlib.MAX_WBITS | 32)
+    if encoding == "deflate":
+        return _DeflateDecompressor()
+    return False
+
+class _DeflateDecompressor:
+    """
+    deflate kicsomagoló zlib fejléccel vagy anélkül
+
+    Egyes szerverek a "deflate" kódolást fejléc nélküli (nyers) deflate-ként
+    küldik; a urllib3-hoz hasonlóan az első zlib.error után nyers módban
+    újrapróbáljuk az addig kapott adattal.
+    """
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj()
+        self._first_data = b""  # a fejléc eldőltéig kapott bájtok
+
+    def decompress(self, data, max_length=0):
+        if self._first_data is None:
+            return self._decompressor.decompress(data, max_length)
+        self._first_data += data
+        try:
+            chunk = self._decompressor.decompress(data, max_length)
+        except zlib.error:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            data, self._first_data = self._first_data, None
+            return self._decompressor.decompress(data, max_length)
+        if len(self._first_data) >= 2:
+            self._first_data = None  # a két bájtos zlib fejléc rendben volt
+        return chunk
+
+    @property
+    def unconsumed_tail(self):
+        return self._decompressor.unconsumed_tail
+
+    def flush(self):
+        return self._decompressor.flush()
+
+def iter_body(response, max_bytes=None, chunk_size=CHUNK_SIZE):
+    """
+    Streamelt válasz törzsének olvasása darabonként (dekódolt bájtok)
+
+    Olvasás közben a response.wire_bytes (hálózaton átjött, pl. gzip-elt)
+    és a response.decoded_bytes (kicsomagolt) attribútumok frissülnek.
+    Ha bármelyik meghaladja a max_bytes-ot, a kapcsolat lezárul és
+    ResponseTooLarge kivétel keletkezik.
+
+    A nyers (tömörített) darabokat magunk számoljuk és csomagoljuk ki, mert a
+    urllib3 tell() értéke chunked válaszoknál nem nő. Ismeretlen kódolásnál
+    (pl. br) a urllib3 dekódol, ekkor a wire_bytes None.
+    """
+    decompressor = _content_decompressor(response)
+    response.wire_bytes = 0 if decompressor is not False else None
+    response.decoded_bytes = 0
+
+    def check_size():
+        if max_bytes is not None and max(response.wire_bytes or 0, response.decoded_bytes) > max_bytes:
+            raise ResponseTooLarge(
+                f"A válasz nagyobb, mint {max_bytes} bájt "
+                f"(eddig: {response.wire_bytes} wire / {response.decoded_bytes} dekódolt)"
+            )
+
+    completed = False
+    try:
+        if decompressor is False:
+            for chunk in response.raw.stream(chunk_size, decode_content=True):
+                response.decoded_bytes += len(chunk)
+                check_size()
+                yield chunk
+            completed = True
+            return
+
+        for raw_chunk in response.raw.stream(chunk_size, decode_content=False):
+            response.wire_bytes += len(raw_chunk)
+            check_size()
+            if decompressor is None:
+                response.decoded_bytes += len(raw_chunk)
+                check_size()
+                yield raw_chunk
+                continue
+            # Legfeljebb chunk_size méretű kimenet lépésenként: egy "gzip bomba"
+            # sem kerül egyszerre memóriába, és a korlát időben megállítja
+            data = raw_chunk
+            while data:
+                chunk = decompressor.decompress(data, chunk_size)
+                data = decompressor.unconsumed_tail
+                if chunk:
+                    response.decoded_bytes += len(chunk)
+                    check_size()
+                    yield chunk
+        if decompressor is not None:
+            chunk = decompressor.flush()
+            if chunk:
+                response.decoded_bytes += len(chunk)
+                check_size()
+                yield chunk
+        completed = True
+    finally:
+        response.close()
+        # A teljes törzs mérete a kérés megfigyelőknek átadott rekordba
+        record = getattr(response, "request_record", None)
+        if completed and record is not None:
+            record["bytes"] = response.decoded_bytes
+            record["wire_bytes"] = response.wire_bytes
+
+def measure_body(response, max_bytes=None):
+    """
+    Válaszméret mérése a törzs megtartása nélkül
+
+    Returns:
+        dict: wire_bytes (hálózati, tömörített) és decoded_bytes (kicsomagolt)
+    """
+    for _ in iter_body(response, max_bytes):
+        pass
+    return {"wire_bytes": response.wire_bytes, "decoded_bytes": response.decoded_bytes}
+
+def iter_results(response, max_bytes=None, key="results"):
+    """
+    A JSON válasz "results" listájának elemei egyesével, inkrementális feldolgozással
+
+    Csak az éppen feldolgozott elem van memóriában (a többi kulcs értékét
+    dekódolás nélkül átugorja); ha a hívó korábban abbahagyja az iterálást,
+    a kapcsolat lezárul és a maradék nem töltődik le.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = (decoder.decode(chunk) for chunk in iter_body(response, max_bytes))
+    try:
+        yield from _iter_json_array(_JsonStream(chunks), key)
+    finally:
+        response.close()
+
+# _JsonStream segédek: a számok végét jelző karakterek és az értékek átugrásának (skip) mintái
+_NUMBER_END = " \t\r\n,]}"
+_SCALAR_END_RE = re.compile(r"[\s,\]}]")
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_STRUCTURAL_RE = re.compile(r'["\[\]{}]')
+
+def _is_number(value):
+    """Szám-e a dekódolt érték (a bool nem az)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class _JsonStream:
+    """Minimális pull-parser: JSON értékek olvasása egy szöveg-darab folyamból"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = ""
+        self._pos = 0
+        self._done = False
+        self._decoder = json.JSONDecoder()
+
+    def _more(self):
+        """Következő darab beolvasása (a már feldolgozott rész eldobásával)"""
+        if self._done:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._done = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Következő nem whitespace karakter (üres string a folyam végén)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._more():
+                return ""
+
+    def expect(self, chars):
+        """A következő karakternek a chars egyikének kell lennie"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Érvénytelen JSON: {chars!r} helyett {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Egy teljes JSON érték beolvasása"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            # Egy szám csak határoló előtt teljes: a "7." vagy "1e" végű darab
+            # után a következő darabban folytatódhat (a raw_decode ilyenkor
+            # a részleges számot adja vissza)
+            complete = not _is_number(value) or (end < len(self._buffer) and self._buffer[end] in _NUMBER_END)
+            if complete or not self._more():
+                self._pos = end
+                return value
+
+    def skip(self):
+        """
+        Egy JSON érték átugrása dekódolás nélkül
+
+        Csak a mélységet és a string állapotot követi, a feldolgozott részt
+        eldobja, így egy nagy érték sem kerül egészben memóriába, és nem
+        dekódolódik újra minden darab után.
+        """
+        first = self.peek()
+        if not first:
+            raise ValueError("Érvénytelen JSON: váratlanul véget ért")
+        if first not in '"[{':
+            # Skalár (szám, true, false, null): a következő határolóig tart
+            while True:
+                match = _SCALAR_END_RE.search(self._buffer, self._pos)
+                if match:
+                    self._pos = match.start()
+                    return
+                self._pos = len(self._buffer)
+                if not self._more():
+                    return
+
+        depth = 0
+        in_string = False
+        while True:
+            pattern = _STRING_SPECIAL_RE if in_string else _STRUCTURAL_RE
+            match = pattern.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+            elif match.group() == "\\":
+                if match.end() < len(self._buffer):
+                    self._pos = match.end() + 1  # az escape-elt karaktert is átlépjük
+                    continue
+                # Escape a darab végén: a következő darabbal együtt dolgozzuk fel
+                self._pos = match.start()
+            else:
+                self._pos = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = not in_string
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                if depth == 0 and not in_string:
+                    return
+                continue
+            if not self._more():
+                raise ValueError("Érvénytelen JSON: váratlanul véget ért")
+
+def _iter_json_array(stream, key):
+    """Egy felső szintű objektum adott kulcsú listájának elemei"""
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key:
+            stream.expect("[")
+            if stream.peek() == "]":
+                return
+            while True:
+                yield stream.value()
+                if stream.expect(",]") == "]":
+                    return
+        stream.skip()  # más kulcs értéke: dekódolás nélkül átugorjuk
+        if stream.expect(",}") == "}":
+            return
@@ -0,0 +1,163 @@
+"""
+Közös pytest fixture-ök
+
+A "faults" fixture a hibainjektáló proxyn (fault_proxy.py) keresztül
+irányítja az api_requests hívásait, így a tesztek lassú vagy instabil
+API-t szimulálhatnak. A forgatókönyv megadható markerrel vagy a tesztből:
+
+    @pytest.mark.fault_scenario(latency=fixed_latency(2.5))
+    def test_slow_api(faults):
+        ...
+
+    def test_rate_limit(faults):
+        faults.scenario = Scenario(burst=(429, 3, 10))
+        ...
+
+Az upstream alapból az api_requests.BASE_URL szervere, a FAULT_PROXY_UPSTREAM
+környezeti változóval helyettesítő szerverre is irányítható.
+
+A stand_in_api fixture egy helyi, TMDB-szerű helyettesítő szerverre irányítja
+az api_requests hívásait, így a kliens és a proxy tesztjei TMDB nélkül futnak.
+
+Minden teszt HTTP kérései (endpoint, státusz, válaszidő, méret) bekerülnek
+a pytest JSON riport teszt metaadataiba (http_requests), ebből dolgozik a
+metrics_exporter.py.
+"""
+import gzip
+import json
+import os
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import api_requests
+from fault_proxy import FaultProxy, Scenario
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "fault_scenario(**kwargs): a faults fixture Scenario paraméterei (lásd fault_proxy.Scenario)"
+    )
+
+
+@pytest.fixture(autouse=True)
+def _record_http_requests(request):
+    """A teszt közben küldött HTTP kérések rögzítése a JSON riporthoz"""
+    records = []
+    request.node.http_requests = records
+    api_requests.add_request_listener(records.append)
+    yield
+    api_requests.remove_request_listener(records.append)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_json_runtest_metadata(item, call):
+    """pytest-json-report hook: a rögzített kérések a teszt metaadataiba"""
+    if call.when != "call":
+        return {}
+    return {"http_requests": getattr(item, "http_requests", [])}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """
+    TMDB-szerű helyettesítő szerver offline tesztekhez
+
+    Query paraméterek: count (találatok száma, alap 20), chunked=1 (chunked
+    transfer-encoding), gzip=0 (tömörítés tiltása, alapból gzip, ha a kliens kéri),
+    deflate=zlib / deflate=raw (deflate kódolás zlib fejléccel / nyers deflate-ként)
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        count = int(query.get("count", ["20"])[0])
+        body = json.dumps({
+            "page": 1,
+            "results": [{"id": i, "title": f"Movie {i}", "release_date": None} for i in range(count)],
+            "total_results": count,
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        deflate = query.get("deflate", [""])[0]
+        if deflate:
+            compressor = zlib.compressobj(wbits=zlib.MAX_WBITS if deflate == "zlib" else -zlib.MAX_WBITS)
+            body = compressor.compress(body) + compressor.flush()
+            self.send_header("Content-Encoding", "deflate")
+        elif query.get("gzip", ["1"])[0] != "0" and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, mtime=0)
+            self.send_header("Content-Encoding", "gzip")
+
+        if query.get("chunked", ["0"])[0] == "1":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for offset in range(0, len(body), 4096):
+                piece = body[offset:offset + 4096]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def stand_in_server():
+    """Helyi helyettesítő szerver a teljes tesztfutás idejére (gyökér URL-t ad vissza)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stand-in-server", daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stand_in_api(stand_in_server, monkeypatch):
+    """Az api_requests hívásai a helyettesítő szerverre mennek a teszt idejére"""
+    base_path = urlsplit(api_requests.BASE_URL).path
+    monkeypatch.setattr(api_requests, "BASE_URL", stand_in_server + base_path)
+    return stand_in_server
+
+
+@pytest.fixture(scope="module")
+def fault_proxy_upstream():
+    """
+    A proxy upstream gyökér URL-je: FAULT_PROXY_UPSTREAM, vagy az api_requests.BASE_URL szervere
+
+    Egy tesztmodul felülírhatja (pl. a helyettesítő szerverre, lásd test_fault_proxy.py).
+    """
+    base = urlsplit(api_requests.BASE_URL)
+    return os.getenv("FAULT_PROXY_UPSTREAM", f"{base.scheme}://{base.netloc}")
+
+
+@pytest.fixture(scope="module")
+def fault_proxy(fault_proxy_upstream):
+    """Tesztmodulonként közös hibainjektáló proxy"""
+    with FaultProxy(fault_proxy_upstream) as proxy:
+        yield proxy
+
+
+@pytest.fixture
+def faults(fault_proxy, monkeypatch, request):
+    """
+    Az api_requests hívásai a proxyn keresztül mennek a teszt idejére
+
+    A proxy objektumot adja vissza: a scenario attribútum a teszt közben
+    cserélhető, a stats szótár az injektált hibákat számolja.
+    """
+    marker = request.node.get_closest_marker("fault_scenario")
+    fault_proxy.reset(Scenario(**marker.kwargs) if marker else None)
+
+    base_path = urlsplit(api_requests.BASE_URL).path
+    monkeypatch.setattr(api_requests, "BASE_URL", fault_proxy.base_url + base_path)
+    yield fault_proxy
+    fault_proxy.reset()
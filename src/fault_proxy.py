@@ -0,0 +1,510 @@
+"""
+Késleltetés- és hibainjektáló proxy
+
+Ez a modul egy helyi HTTP reverse proxyt tartalmaz, ami az api_requests és
+a valódi TMDB API (vagy egy helyettesítő szerver) közé ültethető. A proxy
+forgatókönyv (Scenario) alapján szimulál lassú vagy instabil hálózatot:
+- késleltetés eloszlásokkal (fix, egyenletes, normális, exponenciális)
+- sávszélesség korlát (bájt/másodperc)
+- kapcsolat bontás (TCP reset)
+- véletlen vagy sorozatos (burst) 5xx / 429 válaszok
+- csonkolt válasz törzs
+
+A proxy asyncio alapú, keep-alive kapcsolatokat tart a kliens és az upstream
+felé is, így másodpercenként több ezer kérést is kiszolgál (ha telepítve van,
+uvloop event loopot használ).
+
+Használat pytestből: lásd a conftest.py "faults" fixture-jét.
+
+Használat parancssorból:
+    cd src
+    python fault_proxy.py --port 8080 --latency uniform:0.5:2.5 --burst 429:5:50
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import ssl
+import struct
+import threading
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+try:
+    import uvloop  # opcionális, gyorsabb event loop
+except ImportError:
+    uvloop = None
+
+# Ezeket a fejléceket a proxy nem továbbítja (kapcsolat-szintűek)
+HOP_BY_HOP_HEADERS = frozenset([
+    b'connection', b'keep-alive', b'proxy-authenticate', b'proxy-authorization',
+    b'proxy-connection', b'te', b'trailer', b'transfer-encoding', b'upgrade',
+])
+
+# Sávszélesség korlátozásnál ilyen időközönként küldünk egy szeletet
+BANDWIDTH_TICK = 0.05
+
+# Ennyi szabad upstream kapcsolatot tartunk meg újrahasznosításra
+MAX_IDLE_UPSTREAM = 100
+
+
+# --Késleltetés eloszlások--
+# Mindegyik egy függvényt ad vissza, ami a Scenario véletlengenerátorából
+# egy késleltetést (másodperc) sorsol
+
+def fixed_latency(seconds):
+    """Fix késleltetés"""
+    return lambda rng: seconds
+
+def uniform_latency(low, high):
+    """Egyenletes eloszlású késleltetés [low, high] között"""
+    return lambda rng: rng.uniform(low, high)
+
+def normal_latency(mean, stddev):
+    """Normális eloszlású késleltetés (negatív érték helyett 0)"""
+    return lambda rng: max(0.0, rng.gauss(mean, stddev))
+
+def exponential_latency(mean):
+    """Exponenciális eloszlású késleltetés (ritka, de hosszú kiugrások)"""
+    return lambda rng: rng.expovariate(1.0 / mean)
+
+def parse_latency(spec):
+    """
+    Késleltetés leírás feldolgozása parancssorhoz
+
+    Példák: "fixed:0.5", "uniform:0.1:0.5", "normal:0.3:0.1", "exponential:0.2"
+    """
+    kind, *args = spec.split(':')
+    factories = {
+        'fixed': fixed_latency,
+        'uniform': uniform_latency,
+        'normal': normal_latency,
+        'exponential': exponential_latency,
+    }
+    if kind not in factories:
+        raise ValueError(f"Ismeretlen késleltetés eloszlás: {kind}")
+    return factories[kind](*(float(arg) for arg in args))
+
+
+class Scenario:
+    """
+    Hibainjektálási forgatókönyv
+
+    Args:
+        latency: késleltetés függvény (pl. uniform_latency(0.1, 0.5)) vagy None
+        bandwidth: válasz küldési sebesség bájt/másodpercben, vagy None (korlátlan)
+        reset_rate: ekkora valószínűséggel bontja a kapcsolatot (TCP reset) válasz nélkül
+        error_rate: ekkora valószínűséggel ad error_status hibát az upstream hívása nélkül
+        error_status: hibakód (int) vagy hibakódok listája, amiből véletlenszerűen választ
+        burst: (státuszkód, hossz, periódus) - minden periódus első "hossz" kérése hibát kap,
+               pl. (429, 5, 50): minden 50 kérésből az első 5 "429 Too Many Requests"
+        truncate_rate: ekkora valószínűséggel csak a válasz törzs felét küldi el
+        seed: véletlengenerátor seed a megismételhető futásokhoz
+    """
+
+    def __init__(self, latency=None, bandwidth=None, reset_rate=0.0, error_rate=0.0,
+                 error_status=503, burst=None, truncate_rate=0.0, seed=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.reset_rate = reset_rate
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.burst = burst
+        self.truncate_rate = truncate_rate
+        self.rng = random.Random(seed)
+        self.requests = 0  # ezzel a forgatókönyvvel kiszolgált kérések
+
+    def error_for(self, n):
+        """Az n-edik kérésre adandó injektált hibakód, vagy None"""
+        if self.burst:
+            status, length, every = self.burst
+            if (n - 1) % every < length:
+                return status
+        if self.error_rate and self.rng.random() < self.error_rate:
+            if isinstance(self.error_status, int):
+                return self.error_status
+            return self.rng.choice(self.error_status)
+        return None
+
+
+class FaultProxy:
+    """
+    Hibainjektáló reverse proxy háttérszálon futó asyncio event loop-pal
+
+    A scenario attribútum futás közben bármikor cserélhető; minden kérés
+    az éppen aktuális forgatókönyv szerint kerül kiszolgálásra.
+
+    Args:
+        upstream: a cél szerver gyökér URL-je (pl. "https://api.themoviedb.org")
+        host, port: a proxy címe (port=0: szabad port választása)
+        scenario: kezdeti forgatókönyv (alapból hibamentes továbbítás)
+    """
+
+    def __init__(self, upstream, host="127.0.0.1", port=0, scenario=None):
+        parts = urlsplit(upstream)
+        self.upstream_host = parts.hostname
+        self.upstream_port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self._upstream_ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self._host_header = parts.netloc.encode('ascii')
+        self.host = host
+        self.port = port
+        self.scenario = scenario or Scenario()
+        self.stats = _empty_stats()
+        self._idle_upstream = []
+        self._clients = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """A proxy gyökér URL-je (ehhez kell hozzáfűzni az API útvonalat, pl. "/3")"""
+        return f"http://{self.host}:{self.port}"
+
+    def reset(self, scenario=None):
+        """Forgatókönyv és statisztikák visszaállítása"""
+        self.scenario = scenario or Scenario()
+        self.stats = _empty_stats()
+
+    def start(self):
+        """Proxy indítása háttérszálon"""
+        self._loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle_client, self.host, self.port, backlog=1024)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self._loop.run_forever, name="fault-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Proxy leállítása, nyitott kapcsolatok lezárása"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def _shutdown(self):
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        for _, writer in self._idle_upstream:
+            writer.close()
+        self._idle_upstream.clear()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _handle_client(self, reader, writer):
+        """Egy kliens kapcsolat kiszolgálása (keep-alive: több kérés egymás után)"""
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                try:
+                    method, target, version, headers, length = _parse_request(head)
+                except ValueError:
+                    # Hibás kérés: 400 és a kapcsolat lezárása
+                    writer.write(_response_head(400, [(b'connection', b'close')], 0))
+                    await writer.drain()
+                    return
+                header_map = dict(headers)
+                body = await reader.readexactly(length) if length else b''
+
+                connection = header_map.get(b'connection', b'').lower()
+                keep_alive = connection != b'close' if version == 'HTTP/1.1' else connection == b'keep-alive'
+
+                if not await self._serve(method, target, headers, body, writer) or not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # kliens bontott, vagy a proxy leáll
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _serve(self, method, target, headers, body, writer):
+        """
+        Egy kérés kiszolgálása a forgatókönyv szerint
+
+        Returns:
+            True, ha a kliens kapcsolat tovább használható
+        """
+        scenario = self.scenario
+        rng = scenario.rng
+        scenario.requests += 1
+        self.stats['requests'] += 1
+
+        if scenario.latency is not None:
+            delay = scenario.latency(rng)
+            if delay > 0:
+                self.stats['delayed'] += 1
+                await asyncio.sleep(delay)
+
+        if scenario.reset_rate and rng.random() < scenario.reset_rate:
+            self.stats['resets'] += 1
+            _reset_connection(writer)
+            return False
+
+        status = scenario.error_for(scenario.requests)
+        if status is not None:
+            self.stats['errors'] += 1
+            error_headers = [(b'content-type', b'application/json;charset=utf-8')]
+            if status == 429:
+                error_headers.append((b'retry-after', b'1'))
+            await self._send(writer, status, error_headers, _error_body(status), scenario)
+            return True
+
+        try:
+            status, response_headers, response_body = await self._forward(method, target, headers, body)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            self.stats['upstream_errors'] += 1
+            await self._send(writer, 502, [(b'content-type', b'application/json;charset=utf-8')],
+                             _error_body(502), scenario)
+            return True
+
+        if response_body and scenario.truncate_rate and rng.random() < scenario.truncate_rate:
+            # A fejléc a teljes hosszt ígéri, de csak a fele érkezik meg
+            self.stats['truncated'] += 1
+            writer.write(_response_head(status, response_headers, len(response_body)))
+            writer.write(response_body[:len(response_body) // 2])
+            await writer.drain()
+            return False
+
+        await self._send(writer, status, response_headers, response_body, scenario,
+                         length=None if method == 'HEAD' else len(response_body))
+        return True
+
+    async def _send(self, writer, status, headers, body, scenario, length=-1):
+        """Válasz küldése, sávszélesség korláttal ha a forgatókönyv előírja"""
+        head = _response_head(status, headers, len(body) if length == -1 else length)
+        if not scenario.bandwidth:
+            writer.write(head)
+            writer.write(body)
+            await writer.drain()
+            return
+        self.stats['throttled'] += 1
+        data = head + body
+        step = max(1, int(scenario.bandwidth * BANDWIDTH_TICK))
+        for offset in range(0, len(data), step):
+            piece = data[offset:offset + step]
+            writer.write(piece)
+            await writer.drain()
+            await asyncio.sleep(len(piece) / scenario.bandwidth)
+
+    async def _acquire_upstream(self):
+        """Szabad upstream kapcsolat újrahasznosítása, vagy új nyitása"""
+        while self._idle_upstream:
+            reader, writer = self._idle_upstream.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+        connection = await asyncio.open_connection(
+            self.upstream_host, self.upstream_port, ssl=self._upstream_ssl,
+            server_hostname=self.upstream_host if self._upstream_ssl else None,
+        )
+        return connection, False
+
+    def _release_upstream(self, connection):
+        if len(self._idle_upstream) < MAX_IDLE_UPSTREAM:
+            self._idle_upstream.append(connection)
+        else:
+            connection[1].close()
+
+    async def _forward(self, method, target, headers, body):
+        """
+        Kérés továbbítása az upstream felé
+
+        Returns:
+            (státuszkód, fejlécek, törzs) - a törzs chunked kódolás nélkül
+        """
+        request = [f"{method} {target} HTTP/1.1\r\n".encode('latin-1'),
+                   b'host: ' + self._host_header + b'\r\n']
+        for name, value in headers:
+            if name not in HOP_BY_HOP_HEADERS and name != b'host':
+                request.append(name + b': ' + value + b'\r\n')
+        request.append(b'\r\n')
+        request.append(body)
+        request = b''.join(request)
+
+        # Egy újrahasznosított kapcsolatot az upstream közben lezárhatott: ekkor újrapróbáljuk
+        for attempt in range(2):
+            (reader, writer), reused = await self._acquire_upstream()
+            try:
+                writer.write(request)
+                await writer.drain()
+                head = await reader.readuntil(b'\r\n\r\n')
+                break
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+                writer.close()
+                if not reused or attempt:
+                    raise
+
+        try:
+            status_line, response_headers = _parse_head(head)
+            status = int(status_line.split(b' ', 2)[1])
+            header_map = dict(response_headers)
+            reusable = header_map.get(b'connection', b'').lower() != b'close'
+
+            if method == 'HEAD' or status in (204, 304) or status < 200:
+                response_body = b''
+            elif b'chunked' in header_map.get(b'transfer-encoding', b'').lower():
+                response_body = await _read_chunked(reader)
+            elif b'content-length' in header_map:
+                response_body = await reader.readexactly(int(header_map[b'content-length']))
+            else:
+                response_body = await reader.read()
+                reusable = False
+        except BaseException:
+            writer.close()
+            raise
+
+        if reusable:
+            self._release_upstream((reader, writer))
+        else:
+            writer.close()
+
+        response_headers = [
+            (name, value) for name, value in response_headers
+            if name not in HOP_BY_HOP_HEADERS and (name != b'content-length' or method == 'HEAD')
+        ]
+        return status, response_headers, response_body
+
+
+def _empty_stats():
+    return {
+        'requests': 0,
+        'delayed': 0,
+        'resets': 0,
+        'errors': 0,
+        'truncated': 0,
+        'throttled': 0,
+        'upstream_errors': 0,
+    }
+
+def _parse_head(head):
+    """HTTP fejrész feldolgozása: (első sor, [(kisbetűs név, érték), ...])"""
+    lines = head[:-4].split(b'\r\n')
+    headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        headers.append((name.strip().lower(), value.strip()))
+    return lines[0], headers
+
+def _parse_request(head):
+    """
+    Kérés fejrész feldolgozása
+
+    Returns:
+        (method, target, version, headers, content_length)
+
+    Raises:
+        ValueError: hibás kérés sor vagy Content-Length
+    """
+    request_line, headers = _parse_head(head)
+    method, target, version = request_line.decode('latin-1').split(' ', 2)
+    if not version.startswith('HTTP/'):
+        raise ValueError(f"Érvénytelen HTTP verzió: {version!r}")
+    length = int(dict(headers).get(b'content-length', 0))
+    if length < 0:
+        raise ValueError(f"Érvénytelen Content-Length: {length}")
+    return method, target, version, headers, length
+
+def _response_head(status, headers, length):
+    """HTTP válasz fejrész összeállítása (length=None: nem ír Content-Length-et)"""
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ''
+    lines = [f"HTTP/1.1 {status} {reason}\r\n".encode('latin-1')]
+    for name, value in headers:
+        lines.append(name + b': ' + value + b'\r\n')
+    if length is not None:
+        lines.append(b'content-length: %d\r\n' % length)
+    lines.append(b'\r\n')
+    return b''.join(lines)
+
+async def _read_chunked(reader):
+    """Chunked transfer-encoding törzs beolvasása"""
+    parts = []
+    while True:
+        size_line = await reader.readuntil(b'\r\n')
+        size = int(size_line.split(b';', 1)[0], 16)
+        if size == 0:
+            # Opcionális trailer fejlécek az üres sorig
+            while await reader.readuntil(b'\r\n') != b'\r\n':
+                pass
+            return b''.join(parts)
+        parts.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+def _error_body(status):
+    """TMDB stílusú hibaüzenet JSON törzs"""
+    return json.dumps({
+        'success': False,
+        'status_code': status,
+        'status_message': f"Injected fault: {status}",
+    }).encode('utf-8')
+
+def _reset_connection(writer):
+    """Kapcsolat azonnali bontása TCP RST-vel (SO_LINGER 0)"""
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+
+def parse_args(argv=None):
+    """Parancssori argumentumok"""
+    parser = argparse.ArgumentParser(description="Késleltetés- és hibainjektáló proxy a TMDB API elé")
+    parser.add_argument('--upstream', default="https://api.themoviedb.org", help="cél szerver gyökér URL-je")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=parse_latency, help="pl. fixed:0.5, uniform:0.1:0.5, normal:0.3:0.1, exponential:0.2")
+    parser.add_argument('--bandwidth', type=float, help="sávszélesség korlát bájt/másodpercben")
+    parser.add_argument('--reset-rate', type=float, default=0.0, help="kapcsolat bontás valószínűsége")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="injektált hiba valószínűsége")
+    parser.add_argument('--error-status', type=int, default=503, help="injektált hibakód (alap: 503)")
+    parser.add_argument('--burst', help="hibasorozat státusz:hossz:periódus formában, pl. 429:5:50")
+    parser.add_argument('--truncate-rate', type=float, default=0.0, help="csonkolt válasz valószínűsége")
+    parser.add_argument('--seed', type=int, help="véletlengenerátor seed")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    scenario = Scenario(
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        reset_rate=args.reset_rate,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        burst=tuple(int(part) for part in args.burst.split(':')) if args.burst else None,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    proxy = FaultProxy(args.upstream, host=args.host, port=args.port, scenario=scenario)
+    proxy.start()
+    print(f"🔌 Hibainjektáló proxy: {proxy.base_url} -> {args.upstream}")
+    print("   Az api_requests BASE_URL-je legyen pl.: " + proxy.base_url + "/3")
+    print("   Leállítás: Ctrl+C")
+    try:
+        proxy._thread.join()
+    except KeyboardInterrupt:
+        proxy.stop()
@@ -0,0 +1,252 @@
+"""
+OpenMetrics / Prometheus exporter teszt- és kérés metrikákhoz
+
+Ez a modul a tesztfutás eredményeit a monitorozó rendszer által olvasható
+OpenMetrics (Prometheus) szöveges formátumba alakítja:
+- api_test_results_total: tesztek száma kimenet szerint (passed/failed/skipped)
+- api_test_duration_seconds: teszt futási idők hisztogramja
+- api_http_request_duration_seconds: HTTP válaszidők hisztogramja endpointonként
+- api_http_response_size_bytes: legnagyobb válaszméret endpointonként
+
+Minden metrika "test" és "endpoint" címkét kap. A HTTP adatokat a conftest.py
+a pytest JSON riport teszt metaadataiba (http_requests) menti.
+
+Kimenetek:
+- fájl a node-exporter textfile collectorához (atomikus cserével írva)
+- opcionális helyi /metrics végpont hosszú futásokhoz (pl. run_soak.py --metrics-port)
+
+Használat:
+    cd src
+    python metrics_exporter.py                          # legutolsó JSON riport -> ../reports/metrics.prom
+    python metrics_exporter.py --report R.json --output /var/lib/node_exporter/textfile/api_tests.prom
+"""
+import argparse
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import api_requests
+from report_generator import find_latest_json_report, get_project_root, load_json_report
+
+# Hisztogram határok (másodperc)
+TEST_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+HTTP_LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    """Egyszerű hisztogram: bucketenkénti darabszám, összeg, elemszám"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # az utolsó a +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsCollector:
+    """
+    Teszt és HTTP metrikák gyűjtése és OpenMetrics szöveggé alakítása
+
+    Adatforrások:
+    - add_report(): pytest JSON riport (tesztek + a metaadatokban rögzített kérések)
+    - listen(): élő gyűjtés az api_requests kérés megfigyelőjén keresztül
+    """
+
+    def __init__(self):
+        self.test_results = {}    # (test, endpoint, outcome) -> darab
+        self.test_durations = {}  # (test, endpoint) -> _Histogram
+        self.http_latency = {}    # (test, endpoint, code) -> _Histogram
+        self.response_size = {}   # (test, endpoint) -> legnagyobb méret bájtban
+        self.current_test = ""    # élő gyűjtésnél ehhez a teszthez kötjük a kéréseket
+        self._lock = threading.Lock()
+
+    def observe_test(self, test, outcome, duration, endpoint=""):
+        """Egy teszt eredményének rögzítése"""
+        with self._lock:
+            key = (test, endpoint, outcome)
+            self.test_results[key] = self.test_results.get(key, 0) + 1
+            histogram = self.test_durations.get((test, endpoint))
+            if histogram is None:
+                histogram = self.test_durations[(test, endpoint)] = _Histogram(TEST_DURATION_BUCKETS)
+            histogram.observe(duration)
+
+    def observe_request(self, record, test=None):
+        """Egy HTTP kérés rekordjának rögzítése (lásd api_requests megfigyelők)"""
+        test = self.current_test if test is None else test
+        endpoint = record['endpoint']
+        with self._lock:
+            key = (test, endpoint, str(record['status']))
+            histogram = self.http_latency.get(key)
+            if histogram is None:
+                histogram = self.http_latency[key] = _Histogram(HTTP_LATENCY_BUCKETS)
+            histogram.observe(record['elapsed'])
+            size = record.get('bytes')
+            if size is not None and size > self.response_size.get((test, endpoint), -1):
+                self.response_size[(test, endpoint)] = size
+
+    def add_report(self, report_data):
+        """pytest JSON riport összes tesztjének feldolgozása"""
+        for test in report_data.get('tests', []):
+            name = test.get('nodeid', 'unknown').split('::', 1)[-1]
+            requests_made = test.get('metadata', {}).get('http_requests', [])
+            endpoints = sorted({record['endpoint'] for record in requests_made})
+            self.observe_test(
+                name,
+                test.get('outcome', 'unknown'),
+                test.get('call', {}).get('duration', 0),
+                ','.join(endpoints),
+            )
+            for record in requests_made:
+                self.observe_request(record, test=name)
+
+    def listen(self):
+        """Élő gyűjtés indítása az api_requests kéréseiből"""
+        api_requests.add_request_listener(self.observe_request)
+
+    def stop_listening(self):
+        """Élő gyűjtés leállítása"""
+        api_requests.remove_request_listener(self.observe_request)
+
+    def render(self, openmetrics=True):
+        """
+        Metrikák szöveges formában
+
+        Args:
+            openmetrics: True - OpenMetrics 1.0 (# EOF lezárással),
+                         False - Prometheus 0.0.4 szöveges formátum (textfile collector)
+        """
+        lines = []
+        with self._lock:
+            counter_family = 'api_test_results' if openmetrics else 'api_test_results_total'
+            lines.append(f"# HELP {counter_family} Tesztek száma kimenet szerint.")
+            lines.append(f"# TYPE {counter_family} counter")
+            for (test, endpoint, outcome), value in self.test_results.items():
+                labels = _labels(test=test, endpoint=endpoint, outcome=outcome)
+                lines.append(f"api_test_results_total{{{labels}}} {value}")
+
+            _render_histograms(lines, 'api_test_duration_seconds', "Teszt futási idő másodpercben.",
+                               self.test_durations, ('test', 'endpoint'))
+            _render_histograms(lines, 'api_http_request_duration_seconds', "HTTP válaszidő másodpercben.",
+                               self.http_latency, ('test', 'endpoint', 'code'))
+
+            lines.append("# HELP api_http_response_size_bytes Legnagyobb válasz törzs méret bájtban.")
+            lines.append("# TYPE api_http_response_size_bytes gauge")
+            for (test, endpoint), size in self.response_size.items():
+                lines.append(f"api_http_response_size_bytes{{{_labels(test=test, endpoint=endpoint)}}} {size}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _escape(value):
+    """Címke érték escape-elése (\\, " és sortörés)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+def _render_histograms(lines, name, help_text, histograms, label_names):
+    """Hisztogram család kiírása (_bucket, _sum, _count sorok)"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in histograms.items():
+        labels = _labels(**dict(zip(label_names, key)))
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound!r}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def write_textfile(collector, output_filepath):
+    """
+    Metrikák írása a node-exporter textfile collectorához
+
+    Ideiglenes fájlba ír, majd atomikusan lecseréli a célfájlt, így a
+    collector sosem olvas félkész fájlt.
+    """
+    text = collector.render(openmetrics=False)
+    tmp_filepath = f"{output_filepath}.{os.getpid()}.tmp"
+    with open(tmp_filepath, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_filepath, output_filepath)
+
+
+def start_http_server(collector, port, host="127.0.0.1"):
+    """
+    Helyi /metrics végpont indítása háttérszálon
+
+    Az Accept fejléc alapján OpenMetrics vagy Prometheus formátumban válaszol.
+
+    Returns:
+        A szerver objektum (leállítás: server.shutdown())
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+            body = collector.render(openmetrics=openmetrics).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrape-enként ne írjon a konzolra
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
+
+
+def export_report(json_filepath, output_filepath=None):
+    """
+    pytest JSON riport exportálása textfile collector fájlba
+
+    Args:
+        json_filepath: pytest JSON riport fájl útvonala
+        output_filepath: kimeneti .prom fájl (alapból reports/metrics.prom)
+    """
+    if output_filepath is None:
+        output_filepath = os.path.join(get_project_root(), 'reports', 'metrics.prom')
+    collector = MetricsCollector()
+    collector.add_report(load_json_report(json_filepath))
+    write_textfile(collector, output_filepath)
+    print(f"✅ Metrikák exportálva: {output_filepath}")
+    return output_filepath
+
+
+# fő program, ha közvetlenül futtajuk
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pytest JSON riport exportálása OpenMetrics formátumba")
+    parser.add_argument('--report', help="pytest JSON riport (alapból a legutolsó a reports/ mappában)")
+    parser.add_argument('--output', default=os.getenv('METRICS_TEXTFILE'),
+                        help="kimeneti .prom fájl (alapból METRICS_TEXTFILE vagy reports/metrics.prom)")
+    args = parser.parse_args()
+
+    json_file = args.report or find_latest_json_report(os.path.join(get_project_root(), 'reports'))
+    if json_file:
+        export_report(json_file, args.output)
+    else:
+        print("⚠️ Nem található JSON riport a reports/ mappában!")
+        print("   Futtasd először a teszteket: cd src && python run_tests.py")
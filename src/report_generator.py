@@ -24,6 +24,400 @@ import glob
 from pathlib import Path
 
 
+# Közös stíluslap: a teszt dashboard és a soak dashboard is ezt használja
+DASHBOARD_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 20px;
+    min-height: 100vh;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 15px;
+    box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+    overflow: hidden;
+}
+
+.header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 30px;
+    text-align: center;
+}
+
+.header h1 {
+    font-size: 2.5em;
+    margin-bottom: 10px;
+}
+
+.header p {
+    font-size: 1.1em;
+    opacity: 0.9;
+}
+
+.stats {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+    gap: 20px;
+    padding: 30px;
+    background: #f8f9fa;
+}
+
+.stat-card {
+    background: white;
+    padding: 20px;
+    border-radius: 10px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    text-align: center;
+    transition: transform 0.3s ease;
+}
+
+.stat-card:hover {
+    transform: translateY(-5px);
+}
+
+.stat-card .number {
+    font-size: 3em;
+    font-weight: bold;
+    margin: 10px 0;
+}
+
+.stat-card .label {
+    color: #666;
+    font-size: 0.9em;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+.passed .number { color: #28a745; }
+.failed .number { color: #dc3545; }
+.skipped .number { color: #ffc107; }
+.total .number { color: #667eea; }
+.duration .number { font-size: 2em; }
+.success-rate .number { color: #17a2b8; }
+
+.tests-section {
+    padding: 30px;
+}
+
+.tests-section h2 {
+    color: #333;
+    margin-bottom: 20px;
+    border-bottom: 3px solid #667eea;
+    padding-bottom: 10px;
+}
+
+.test-item {
+    background: #f8f9fa;
+    padding: 15px;
+    margin-bottom: 10px;
+    border-radius: 8px;
+    border-left: 5px solid #ddd;
+    transition: all 0.3s ease;
+}
+
+.test-item:hover {
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+}
+
+.test-item.passed {
+    border-left-color: #28a745;
+    background: #d4edda;
+}
+
+.test-item.failed {
+    border-left-color: #dc3545;
+    background: #f8d7da;
+}
+
+.test-item.skipped {
+    border-left-color: #ffc107;
+    background: #fff3cd;
+}
+
+.test-name {
+    font-weight: bold;
+    color: #333;
+    margin-bottom: 5px;
+}
+
+.test-meta {
+    font-size: 0.9em;
+    color: #666;
+}
+
+.test-error {
+    margin-top: 10px;
+    padding: 10px;
+    background: white;
+    border-radius: 5px;
+    font-family: 'Courier New', monospace;
+    font-size: 0.85em;
+    color: #721c24;
+    white-space: pre-wrap;
+    max-height: 200px;
+    overflow-y: auto;
+}
+
+.badge {
+    display: inline-block;
+    padding: 5px 10px;
+    border-radius: 20px;
+    font-size: 0.85em;
+    font-weight: bold;
+    text-transform: uppercase;
+}
+
+.badge.passed { background: #28a745; color: white; }
+.badge.failed { background: #dc3545; color: white; }
+.badge.skipped { background: #ffc107; color: #333; }
+
+.footer {
+    background: #333;
+    color: white;
+    text-align: center;
+    padding: 20px;
+    font-size: 0.9em;
+}
+
+.progress-bar {
+    width: 100%;
+    height: 30px;
+    background: #e9ecef;
+    border-radius: 15px;
+    overflow: hidden;
+    margin: 20px 0;
+}
+
+.progress-fill {
+    height: 100%;
+    background: linear-gradient(90deg, #28a745 0%, #20c997 100%);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-weight: bold;
+    transition: width 1s ease;
+}
+"""
+
+# Kompakt dashboard: a futásonkénti HTML csak a beágyazott JSON adatot
+# tartalmazza, a stílus és a renderelő script közös fájlokban van (assets/)
+DASHBOARD_ASSETS_DIR = 'assets'
+
+DASHBOARD_APP_CSS = """
+.generated {
+    font-size: 0.9em;
+    margin-top: 10px;
+}
+
+.controls {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 10px;
+    margin-bottom: 20px;
+}
+
+.controls input,
+.controls select {
+    padding: 8px 12px;
+    border: 1px solid #ddd;
+    border-radius: 8px;
+    font-size: 0.95em;
+}
+
+.controls input {
+    flex: 1;
+    min-width: 200px;
+}
+
+.result-count {
+    color: #666;
+    font-size: 0.9em;
+    margin-bottom: 10px;
+}
+
+.more-button {
+    display: block;
+    margin: 20px auto 0;
+    padding: 10px 25px;
+    border: none;
+    border-radius: 20px;
+    background: #667eea;
+    color: white;
+    font-weight: bold;
+    cursor: pointer;
+}
+"""
+
+DASHBOARD_JS = """
+/* API Test Dashboard - kliens oldali renderelés a beágyazott JSON adatból */
+(function () {
+    'use strict';
+
+    var PAGE_SIZE = 200;  // ennyi teszt kerül egyszerre a DOM-ba (nagy futásoknál is gyors)
+
+    var data = JSON.parse(document.getElementById('run-data').textContent);
+    var tests = data.tests.map(function (row, index) {
+        return {
+            name: data.files[row[0]] + '::' + row[1],
+            outcome: data.outcomes[row[2]],
+            duration: row[3],
+            error: row[4] || '',
+            index: index
+        };
+    });
+    var state = {outcome: 'all', query: '', sort: 'default', limit: PAGE_SIZE};
+
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"']/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+        });
+    }
+
+    function renderStats() {
+        var s = data.summary;
+        var cards = [
+            ['total', 'Összes teszt', s.total],
+            ['passed', 'Sikeres', s.passed],
+            ['failed', 'Sikertelen', s.failed],
+            ['skipped', 'Kihagyott', s.skipped],
+            ['duration', 'Futási idő', s.duration + 's'],
+            ['success-rate', 'Sikerességi arány', s.success_rate + '%']
+        ];
+        document.getElementById('stats').innerHTML = cards.map(function (card) {
+            return '<div class="stat-card ' + card[0] + '"><div class="label">' + card[1] +
+                '</div><div class="number">' + card[2] + '</div></div>';
+        }).join('');
+        var progress = document.getElementById('progress');
+        progress.style.width = s.success_rate + '%';
+        progress.textContent = s.success_rate + '% Sikeres';
+    }
+
+    function renderFilterOptions() {
+        var select = document.getElementById('outcome-filter');
+        data.outcomes.forEach(function (outcome) {
+            var option = document.createElement('option');
+            option.value = outcome;
+            option.textContent = outcome;
+            select.appendChild(option);
+        });
+    }
+
+    function visibleTests() {
+        var query = state.query.toLowerCase();
+        var result = tests.filter(function (test) {
+            return (state.outcome === 'all' || test.outcome === state.outcome) &&
+                (!query || test.name.toLowerCase().indexOf(query) !== -1);
+        });
+        if (state.sort === 'name') {
+            result.sort(function (a, b) { return a.name < b.name ? -1 : a.name > b.name ? 1 : 0; });
+        } else if (state.sort === 'duration') {
+            result.sort(function (a, b) { return b.duration - a.duration; });
+        } else if (state.sort === 'outcome') {
+            result.sort(function (a, b) {
+                return a.outcome < b.outcome ? -1 : a.outcome > b.outcome ? 1 : a.index - b.index;
+            });
+        }
+        return result;
+    }
+
+    function renderTests() {
+        var result = visibleTests();
+        var shown = result.slice(0, state.limit);
+        document.getElementById('result-count').textContent =
+            shown.length + ' / ' + result.length + ' teszt (összesen ' + tests.length + ')';
+        document.getElementById('tests').innerHTML = shown.map(function (test) {
+            return '<div class="test-item ' + test.outcome + '">' +
+                '<div class="test-name"><span class="badge ' + test.outcome + '">' + test.outcome + '</span> ' +
+                escapeHtml(test.name) + '</div>' +
+                '<div class="test-meta">⏱️ Futási idő: ' + test.duration + 's</div>' +
+                (test.error ? '<div class="test-error">' + escapeHtml(test.error) + '</div>' : '') +
+                '</div>';
+        }).join('');
+        document.getElementById('more').hidden = result.length <= state.limit;
+    }
+
+    function update(changes) {
+        Object.keys(changes).forEach(function (key) { state[key] = changes[key]; });
+        state.limit = changes.limit || PAGE_SIZE;
+        renderTests();
+    }
+
+    document.getElementById('outcome-filter').addEventListener('change', function (e) {
+        update({outcome: e.target.value});
+    });
+    document.getElementById('search').addEventListener('input', function (e) {
+        update({query: e.target.value});
+    });
+    document.getElementById('sort').addEventListener('change', function (e) {
+        update({sort: e.target.value});
+    });
+    document.getElementById('more').addEventListener('click', function () {
+        update({limit: state.limit + PAGE_SIZE});
+    });
+
+    renderStats();
+    renderFilterOptions();
+    renderTests();
+})();
+"""
+
+COMPACT_DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html lang="hu">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>API Test Dashboard</title>
+<link rel="stylesheet" href="{{ assets }}/dashboard.css">
+</head>
+<body>
+<div class="container">
+<div class="header">
+<h1>API Test Dashboard</h1>
+<p>TMDB API Automatizált Tesztelés</p>
+<p class="generated">Generálva: {{ timestamp }}</p>
+</div>
+<div class="stats" id="stats"></div>
+<div style="padding: 0 30px;"><div class="progress-bar"><div class="progress-fill" id="progress"></div></div></div>
+<div class="tests-section">
+<h2>📋 Teszt Részletek</h2>
+<div class="controls">
+<select id="outcome-filter"><option value="all">Minden kimenet</option></select>
+<input id="search" type="search" placeholder="Keresés teszt névre...">
+<select id="sort">
+<option value="default">Futási sorrend</option>
+<option value="name">Név szerint</option>
+<option value="duration">Futási idő szerint (csökkenő)</option>
+<option value="outcome">Kimenet szerint</option>
+</select>
+</div>
+<div class="result-count" id="result-count"></div>
+<div id="tests"></div>
+<button id="more" class="more-button" hidden>Több mutatása</button>
+</div>
+<div class="footer">
+<p>Automatizált API Tesztelés</p>
+<p>Python + pytest + TMDB API</p>
+</div>
+</div>
+<script id="run-data" type="application/json">{{ data }}</script>
+<script src="{{ assets }}/dashboard.js"></script>
+</body>
+</html>
+"""
+
+
 def get_project_root():
     """
     Projekt gyökér mappájának meghatározása
@@ -39,13 +433,71 @@ def load_json_report(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def generate_dashboard(json_filepath, output_filepath=None):
+def write_dashboard_assets(output_dir):
+    """
+    Közös dashboard CSS és JS kiírása az output_dir/assets mappába
+
+    Csak akkor ír, ha a fájl hiányzik vagy a tartalma eltér, így
+    futásonként nem keletkezik új példány.
+    """
+    assets_dir = os.path.join(output_dir, DASHBOARD_ASSETS_DIR)
+    os.makedirs(assets_dir, exist_ok=True)
+    for filename, content in (
+        ('dashboard.css', DASHBOARD_CSS + DASHBOARD_APP_CSS),
+        ('dashboard.js', DASHBOARD_JS),
+    ):
+        filepath = os.path.join(assets_dir, filename)
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    continue
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def _compact_run_data(summary, test_details):
+    """
+    Tömör JSON adat a kompakt dashboardhoz
+
+    A teszt sorok listák (nem objektumok), a fájlnév és a kimenet csak
+    indexként szerepel, a hibaüzenet csak sikertelen teszteknél.
+    """
+    files = []
+    file_index = {}
+    outcomes = []
+    outcome_index = {}
+    rows = []
+    for test in test_details:
+        filename, _, name = test['name'].rpartition('::')
+        if filename not in file_index:
+            file_index[filename] = len(files)
+            files.append(filename)
+        if test['outcome'] not in outcome_index:
+            outcome_index[test['outcome']] = len(outcomes)
+            outcomes.append(test['outcome'])
+        row = [file_index[filename], name, outcome_index[test['outcome']], test['duration']]
+        if test['error']:
+            row.append(test['error'])
+        rows.append(row)
+
+    data = json.dumps(
+        {'summary': summary, 'files': files, 'outcomes': outcomes, 'tests': rows},
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    # "</script>" nem zárhatja le idő előtt a beágyazó script taget
+    return data.replace('</', '<\\/')
+
+
+def generate_dashboard(json_filepath, output_filepath=None, compact=False):
     """
     Dashboard generálás Jinja2 sablonnal
     
     Args:
         json_filepath: pytest JSON riport fájl útvonala
         output_filepath: Kimeneti HTML fájl útvonala (opcionális, automatikus timestamp)
+        compact: True esetén kis méretű HTML beágyazott JSON adattal, a CSS és JS
+                 közös fájlokból (assets/) töltődik, a lista a böngészőben renderelődik
     """
     # JSON betöltése
     report_data = load_json_report(json_filepath)
@@ -96,189 +548,7 @@ def generate_dashboard(json_filepath, output_filepath=None):
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>API Test Dashboard</title>
         <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                padding: 20px;
-                min-height: 100vh;
-            }
-            
-            .container {
-                max-width: 1200px;
-                margin: 0 auto;
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-                overflow: hidden;
-            }
-            
-            .header {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                text-align: center;
-            }
-            
-            .header h1 {
-                font-size: 2.5em;
-                margin-bottom: 10px;
-            }
-            
-            .header p {
-                font-size: 1.1em;
-                opacity: 0.9;
-            }
-            
-            .stats {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                padding: 30px;
-                background: #f8f9fa;
-            }
-            
-            .stat-card {
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                text-align: center;
-                transition: transform 0.3s ease;
-            }
-            
-            .stat-card:hover {
-                transform: translateY(-5px);
-            }
-            
-            .stat-card .number {
-                font-size: 3em;
-                font-weight: bold;
-                margin: 10px 0;
-            }
-            
-            .stat-card .label {
-                color: #666;
-                font-size: 0.9em;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            
-            .passed .number { color: #28a745; }
-            .failed .number { color: #dc3545; }
-            .skipped .number { color: #ffc107; }
-            .total .number { color: #667eea; }
-            .duration .number { font-size: 2em; }
-            .success-rate .number { color: #17a2b8; }
-            
-            .tests-section {
-                padding: 30px;
-            }
-            
-            .tests-section h2 {
-                color: #333;
-                margin-bottom: 20px;
-                border-bottom: 3px solid #667eea;
-                padding-bottom: 10px;
-            }
-            
-            .test-item {
-                background: #f8f9fa;
-                padding: 15px;
-                margin-bottom: 10px;
-                border-radius: 8px;
-                border-left: 5px solid #ddd;
-                transition: all 0.3s ease;
-            }
-            
-            .test-item:hover {
-                box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            }
-            
-            .test-item.passed {
-                border-left-color: #28a745;
-                background: #d4edda;
-            }
-            
-            .test-item.failed {
-                border-left-color: #dc3545;
-                background: #f8d7da;
-            }
-            
-            .test-item.skipped {
-                border-left-color: #ffc107;
-                background: #fff3cd;
-            }
-            
-            .test-name {
-                font-weight: bold;
-                color: #333;
-                margin-bottom: 5px;
-            }
-            
-            .test-meta {
-                font-size: 0.9em;
-                color: #666;
-            }
-            
-            .test-error {
-                margin-top: 10px;
-                padding: 10px;
-                background: white;
-                border-radius: 5px;
-                font-family: 'Courier New', monospace;
-                font-size: 0.85em;
-                color: #721c24;
-                white-space: pre-wrap;
-                max-height: 200px;
-                overflow-y: auto;
-            }
-            
-            .badge {
-                display: inline-block;
-                padding: 5px 10px;
-                border-radius: 20px;
-                font-size: 0.85em;
-                font-weight: bold;
-                text-transform: uppercase;
-            }
-            
-            .badge.passed { background: #28a745; color: white; }
-            .badge.failed { background: #dc3545; color: white; }
-            .badge.skipped { background: #ffc107; color: #333; }
-            
-            .footer {
-                background: #333;
-                color: white;
-                text-align: center;
-                padding: 20px;
-                font-size: 0.9em;
-            }
-            
-            .progress-bar {
-                width: 100%;
-                height: 30px;
-                background: #e9ecef;
-                border-radius: 15px;
-                overflow: hidden;
-                margin: 20px 0;
-            }
-            
-            .progress-fill {
-                height: 100%;
-                background: linear-gradient(90deg, #28a745 0%, #20c997 100%);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-weight: bold;
-                transition: width 1s ease;
-            }
+            {{ css }}
         </style>
     </head>
     <body>
@@ -351,9 +621,26 @@ def generate_dashboard(json_filepath, output_filepath=None):
     </html>
     """
     
+    # Kompakt mód: közös CSS/JS fájlok + beágyazott JSON adat
+    data = None
+    if compact:
+        write_dashboard_assets(os.path.dirname(output_filepath))
+        html_template = COMPACT_DASHBOARD_TEMPLATE
+        data = _compact_run_data({
+            'total': total,
+            'passed': passed,
+            'failed': failed,
+            'skipped': skipped,
+            'duration': round(total_test_duration, 2),
+            'success_rate': round(success_rate, 1),
+        }, test_details)
+
     # Sablon renderelése
     template = Template(html_template)
     html_output = template.render(
+        css=DASHBOARD_CSS,
+        assets=DASHBOARD_ASSETS_DIR,
+        data=data,
         timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         total=total,
         passed=passed,
@@ -373,6 +660,250 @@ def generate_dashboard(json_filepath, output_filepath=None):
     print(f"⏱️  Összes futási idő: {round(total_test_duration, 2)}s")
 
 
+def _series_points(samples, metric, width=1000, height=160):
+    """
+    SVG polyline pontok egy metrika idősorához (soak dashboard)
+
+    Returns:
+        (points, min, max) - points a polyline "points" attribútuma, üres ha nincs adat
+    """
+    values = [(s['elapsed'], s[metric]) for s in samples if s.get(metric) is not None]
+    if not values:
+        return '', None, None
+    max_x = max(x for x, _ in values) or 1
+    low = min(y for _, y in values)
+    high = max(y for _, y in values)
+    span = (high - low) or 1
+    points = ' '.join(
+        f"{x / max_x * width:.1f},{height - (y - low) / span * height:.1f}"
+        for x, y in values
+    )
+    return points, low, high
+
+
+def generate_soak_dashboard(json_filepath, output_filepath=None):
+    """
+    Soak dashboard generálás a run_soak.py JSON eredményéből
+
+    Args:
+        json_filepath: soak JSON riport fájl útvonala
+        output_filepath: Kimeneti HTML fájl útvonala (opcionális, automatikus timestamp)
+    """
+    soak_data = load_json_report(json_filepath)
+    summary = soak_data.get('summary', {})
+    samples = soak_data.get('samples', [])
+
+    # Idősorok (MB-ban, ahol memória)
+    mb = 1024 * 1024
+    charts = []
+    for metric, label, scale in (
+        ('rss_bytes', 'RSS memória (MB)', mb),
+        ('traced_bytes', 'tracemalloc memória (MB)', mb),
+        ('open_fds', 'Nyitott fájlleírók', 1),
+        ('connections', 'Pool kapcsolatok', 1),
+    ):
+        points, low, high = _series_points(samples, metric)
+        if points:
+            charts.append({
+                'label': label,
+                'points': points,
+                'min': round(low / scale, 1),
+                'max': round(high / scale, 1),
+            })
+
+    last_sample = samples[-1] if samples else {}
+
+    if output_filepath is None:
+        timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = os.path.join(get_project_root(), 'dashboard')
+        os.makedirs(output_dir, exist_ok=True)
+        output_filepath = os.path.join(output_dir, f'soak_{timestamp_str}.html')
+
+    html_template = """
+    <!DOCTYPE html>
+    <html lang="hu">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>API Soak Dashboard</title>
+        <style>
+            {{ css }}
+
+            .chart {
+                background: #f8f9fa;
+                border-radius: 8px;
+                padding: 15px;
+                margin-bottom: 15px;
+            }
+
+            .chart svg {
+                width: 100%;
+                height: 160px;
+            }
+
+            .chart polyline {
+                fill: none;
+                stroke: #667eea;
+                stroke-width: 2;
+            }
+
+            table {
+                width: 100%;
+                border-collapse: collapse;
+                font-size: 0.85em;
+            }
+
+            th, td {
+                text-align: left;
+                padding: 6px 10px;
+                border-bottom: 1px solid #ddd;
+            }
+
+            td.location {
+                font-family: 'Courier New', monospace;
+                word-break: break-all;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>API Soak Dashboard</h1>
+                <p>Memória és kapcsolat szivárgás vizsgálat</p>
+                <p style="font-size: 0.9em; margin-top: 10px;">Generálva: {{ timestamp }}</p>
+            </div>
+
+            <div class="stats">
+                <div class="stat-card total">
+                    <div class="label">Kérések</div>
+                    <div class="number">{{ summary.requests }}</div>
+                </div>
+                <div class="stat-card failed">
+                    <div class="label">Hibák</div>
+                    <div class="number">{{ summary.errors }}</div>
+                </div>
+                <div class="stat-card duration">
+                    <div class="label">Időtartam</div>
+                    <div class="number">{{ config.duration }}s</div>
+                </div>
+                <div class="stat-card {{ 'passed' if summary.passed else 'failed' }}">
+                    <div class="label">Eredmény</div>
+                    <div class="number">{{ 'OK' if summary.passed else ('N/A' if summary.inconclusive else 'LEAK') }}</div>
+                </div>
+            </div>
+
+            <div class="tests-section">
+                <h2>📈 Idősorok</h2>
+                {% for chart in charts %}
+                <div class="chart">
+                    <div class="test-name">{{ chart.label }}</div>
+                    <div class="test-meta">min: {{ chart.min }} | max: {{ chart.max }}</div>
+                    <svg viewBox="0 0 1000 160" preserveAspectRatio="none">
+                        <polyline points="{{ chart.points }}" />
+                    </svg>
+                </div>
+                {% endfor %}
+            </div>
+
+            {% if leaks %}
+            <div class="tests-section">
+                <h2>⚠️ Szivárgás gyanú</h2>
+                {% for leak in leaks %}
+                <div class="test-item failed">
+                    <div class="test-name">
+                        <span class="badge failed">leak</span>
+                        {{ leak.metric }}
+                    </div>
+                    <div class="test-meta">
+                        Növekedés: {{ leak.growth | round(0) }} (küszöb: {{ leak.threshold | round(0) }}),
+                        első: {{ leak.first }}, utolsó: {{ leak.last }}
+                    </div>
+                </div>
+                {% endfor %}
+            </div>
+            {% endif %}
+
+            <div class="tests-section">
+                <h2>🔍 Legnagyobb növekedés (tracemalloc, bemelegítés óta)</h2>
+                <table>
+                    <tr><th>Kódsor</th><th>Növekedés (B)</th><th>Méret (B)</th><th>Darab</th></tr>
+                    {% for stat in top_growth %}
+                    <tr>
+                        <td class="location">{{ stat.location }}</td>
+                        <td>{{ stat.size_diff_bytes }}</td>
+                        <td>{{ stat.size_bytes }}</td>
+                        <td>{{ stat.count }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
+            </div>
+
+            <div class="tests-section">
+                <h2>🧠 Legnagyobb allokálók (utolsó minta)</h2>
+                <table>
+                    <tr><th>Kódsor</th><th>Méret (B)</th><th>Darab</th></tr>
+                    {% for stat in last_sample.top_allocators or [] %}
+                    <tr>
+                        <td class="location">{{ stat.location }}</td>
+                        <td>{{ stat.size_bytes }}</td>
+                        <td>{{ stat.count }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
+            </div>
+
+            <div class="tests-section">
+                <h2>📋 Minták</h2>
+                <table>
+                    <tr>
+                        <th>Idő (s)</th><th>Kérések</th><th>Hibák</th><th>RSS (MB)</th>
+                        <th>tracemalloc (MB)</th><th>FD</th><th>Poolok</th><th>Kapcsolatok</th><th>Szabad</th>
+                    </tr>
+                    {% for s in samples %}
+                    <tr>
+                        <td>{{ s.elapsed }}</td>
+                        <td>{{ s.requests }}</td>
+                        <td>{{ s.errors }}</td>
+                        <td>{{ ((s.rss_bytes or 0) / mb) | round(1) }}</td>
+                        <td>{{ (s.traced_bytes / mb) | round(1) }}</td>
+                        <td>{{ s.open_fds }}</td>
+                        <td>{{ s.pools }}</td>
+                        <td>{{ s.connections }}</td>
+                        <td>{{ s.idle_connections }}</td>
+                    </tr>
+                    {% endfor %}
+                </table>
+            </div>
+
+            <div class="footer">
+                <p>Automatizált API Tesztelés - Soak mód</p>
+                <p>Python + tracemalloc + TMDB API</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+    template = Template(html_template)
+    html_output = template.render(
+        css=DASHBOARD_CSS,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        summary=summary,
+        config=soak_data.get('config', {}),
+        leaks=soak_data.get('leaks', []),
+        top_growth=soak_data.get('top_growth', []),
+        last_sample=last_sample,
+        samples=samples,
+        charts=charts,
+        mb=mb
+    )
+
+    with open(output_filepath, 'w', encoding='utf-8') as f:
+        f.write(html_output)
+
+    print(f"✅ Soak dashboard sikeresen generálva: {output_filepath}")
+
+
 def find_latest_json_report(reports_dir='reports'):
     """
     Megtalálja a legutolsó JSON riport fájlt a megadott mappában
@@ -402,14 +933,22 @@ def find_latest_json_report(reports_dir='reports'):
 
 # fő program, ha közvetlenül futtajuk
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dashboard generálás a legutolsó pytest JSON riportból")
+    parser.add_argument('--compact', action='store_true',
+                        help="kompakt dashboard: közös CSS/JS (dashboard/assets/) + beágyazott JSON adat")
+    args = parser.parse_args()
+
     # Automatikus JSON fájl keresés
     json_file = find_latest_json_report('../reports')
     
     if json_file:
         print(f"📄 Legutolsó JSON riport: {json_file}")
         generate_dashboard(
-            json_filepath=json_file
+            json_filepath=json_file,
             # output_filepath automatikusan generálódik időbélyeggel
+            compact=args.compact
         )
     else:
         print("⚠️ Nem található JSON riport a reports/ mappában!")
@@ -0,0 +1,382 @@
+"""
+Memória- és kapcsolat-soak teszt (hosszú idejű terhelés)
+
+Ez a script az api_requests függvényeiből összeállított vegyes terhelést
+ismétel a megadott ideig, és közben rendszeres időközönként mintát vesz:
+- RSS memória (psutil, vagy Linuxon /proc/self/statm)
+- tracemalloc: követett memória és a legnagyobb allokáló kódsorok
+- nyitott fájlleírók (socketek, fájlok) száma
+- a közös HTTP session kapcsolat-pooljainak mérete
+
+Az idősor a reports/ mappába kerül JSON-ként, és dashboard is készül belőle.
+Ha a memória vagy a fájlleírók száma a bemelegítés után a küszöbnél jobban
+nő, a futás sikertelennek minősül (szivárgás gyanú).
+
+Használat:
+    cd src
+    python run_soak.py --duration 3600 --interval 30
+
+A script exit code-dal tér vissza:
+- 0: nem volt szivárgásra utaló növekedés
+- 1: a memória vagy a fájlleírók száma a küszöb fölé nőtt
+- 2: nem értékelhető (a bemelegítés után kevesebb mint 3 minta készült)
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import requests
+
+import api_requests
+from api_requests import (
+    get_popular_movies,
+    get_movie_details,
+    search_movie,
+    get_movie_genres,
+    get_with_custom_key
+)
+from metrics_exporter import MetricsCollector, start_http_server
+from report_generator import generate_soak_dashboard, get_project_root
+
+try:
+    import psutil  # opcionális, pontosabb RSS és fájlleíró mérés (Windowson is)
+except ImportError:
+    psutil = None
+
+# Vegyes terhelés: (név, hívás) párok, körbe-körbe ismételve.
+# A hívás a kérés timeout-ját kapja: egy beragadt kapcsolat sem állíthatja meg
+# a mintavételezést (a minták csak két kérés között készülnek)
+WORKLOAD = [
+    ("popular", lambda timeout: get_popular_movies(timeout=timeout)),
+    ("popular_page_2", lambda timeout: get_popular_movies(page=2, timeout=timeout)),
+    ("details", lambda timeout: get_movie_details(27205, timeout=timeout)),
+    ("search", lambda timeout: search_movie("The Naked Gun", timeout=timeout)),
+    ("genres", lambda timeout: get_movie_genres(timeout=timeout)),
+    ("invalid_key", lambda timeout: get_with_custom_key("movie/popular", api_key="INVALID_KEY", timeout=timeout)),
+]
+
+# Ennyi legnagyobb allokáló kódsort mentünk mintánként
+TOP_ALLOCATORS = 10
+
+# A növekedés vizsgálatához legalább ennyi bemelegítés utáni minta kell
+MIN_STEADY_SAMPLES = 3
+
+
+def get_rss_bytes():
+    """Aktuális RSS memória bájtban (None, ha nem mérhető)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def count_open_fds():
+    """Nyitott fájlleírók száma (None, ha nem mérhető)"""
+    if psutil is not None:
+        process = psutil.Process()
+        if hasattr(process, 'num_fds'):
+            return process.num_fds()
+        return process.num_handles()  # Windows
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def get_pool_stats(session):
+    """
+    A session kapcsolat-pooljainak összesítése
+
+    Returns:
+        dict: pools (host-onkénti poolok száma), connections (valaha nyitott
+        kapcsolatok), idle_connections (újrahasznosításra váró kapcsolatok)
+    """
+    stats = {'pools': 0, 'connections': 0, 'idle_connections': 0}
+    for adapter in set(session.adapters.values()):
+        container = adapter.poolmanager.pools
+        for key in list(container.keys()):
+            pool = container.get(key)
+            if pool is None:
+                continue
+            stats['pools'] += 1
+            stats['connections'] += pool.num_connections
+            if pool.pool is not None:
+                # A pool sora maxsize-ig None helyőrzőkkel van feltöltve,
+                # ezért a qsize() helyett a valódi kapcsolatokat számoljuk
+                stats['idle_connections'] += sum(conn is not None for conn in list(pool.pool.queue))
+    return stats
+
+
+def _filtered_snapshot():
+    """tracemalloc snapshot a saját (tracemalloc/importlib) zaj nélkül"""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+
+
+def _format_stats(stats):
+    """tracemalloc statisztikák JSON-barát formára alakítása"""
+    result = []
+    for stat in stats[:TOP_ALLOCATORS]:
+        frame = stat.traceback[0]
+        result.append({
+            'location': f"{frame.filename}:{frame.lineno}",
+            'size_bytes': stat.size,
+            'size_diff_bytes': getattr(stat, 'size_diff', None),
+            'count': stat.count,
+        })
+    return result
+
+
+def take_sample(elapsed, requests_done, errors):
+    """Egy mérési pont rögzítése"""
+    gc.collect()  # csak a ténylegesen megtartott memóriát mérjük
+    snapshot = _filtered_snapshot()
+    traced, traced_peak = tracemalloc.get_traced_memory()
+    sample = {
+        'elapsed': round(elapsed, 1),
+        'requests': requests_done,
+        'errors': errors,
+        'rss_bytes': get_rss_bytes(),
+        'open_fds': count_open_fds(),
+        'traced_bytes': traced,
+        'traced_peak_bytes': traced_peak,
+        'top_allocators': _format_stats(snapshot.statistics('lineno')),
+    }
+    sample.update(get_pool_stats(api_requests.SESSION))
+    return sample, snapshot
+
+
+def detect_growth(samples, metric, threshold):
+    """
+    Folyamatos növekedés vizsgálata egy metrikára
+
+    A minták első és utolsó harmadának mediánját hasonlítja össze,
+    így az egyszeri kiugrások nem okoznak téves riasztást.
+
+    Returns:
+        dict a növekedés adataival, ha az meghaladja a küszöböt, különben None
+    """
+    values = [s[metric] for s in samples if s.get(metric) is not None]
+    if len(values) < MIN_STEADY_SAMPLES:
+        return None
+    third = len(values) // 3
+    growth = statistics.median(values[-third:]) - statistics.median(values[:third])
+    if growth <= threshold:
+        return None
+    return {
+        'metric': metric,
+        'growth': growth,
+        'threshold': threshold,
+        'first': values[0],
+        'last': values[-1],
+    }
+
+
+def run_soak(duration, interval, warmup, pause,
+             rss_threshold_mb, traced_threshold_mb, fd_threshold, request_timeout=10):
+    """
+    Soak futás: terhelés ismétlése és mintavételezés
+
+    Args:
+        duration: teljes futási idő másodpercben
+        interval: mintavételezési időköz másodpercben
+        warmup: ennyi ideig tartó bemelegítés mintái nem számítanak a növekedésbe
+        pause: szünet két kérés között (rate limit kímélése)
+        rss_threshold_mb / traced_threshold_mb / fd_threshold: növekedési küszöbök
+        request_timeout: egy kérés timeout-ja másodpercben (a timeout hibának számít)
+
+    Returns:
+        A teljes soak eredmény (dict), ami JSON-ba menthető
+    """
+    tracemalloc.start()
+
+    samples = []
+    status_codes = {}
+    error_types = {}
+    requests_done = 0
+    errors = 0
+    timeouts = 0
+    baseline_snapshot = None
+
+    start = time.monotonic()
+    next_sample = start
+    i = 0
+
+    while True:
+        now = time.monotonic()
+        if now >= next_sample:
+            sample, snapshot = take_sample(now - start, requests_done, errors)
+            samples.append(sample)
+            # A bemelegítés utáni első snapshothoz viszonyítjuk a növekedést
+            if baseline_snapshot is None and sample['elapsed'] >= warmup:
+                baseline_snapshot = snapshot
+            del snapshot
+            next_sample += interval
+            print(f"⏱️  {sample['elapsed']:>8}s | kérések: {requests_done:>6} | "
+                  f"RSS: {(sample['rss_bytes'] or 0) / (1024 * 1024):.1f} MB | "
+                  f"FD: {sample['open_fds']} | kapcsolatok: {sample['connections']}")
+        if now - start >= duration:
+            break
+
+        name, call = WORKLOAD[i % len(WORKLOAD)]
+        i += 1
+        try:
+            response = call(request_timeout)
+            status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+            response.close()
+            del response
+        except Exception as e:
+            errors += 1
+            if isinstance(e, requests.Timeout):
+                timeouts += 1
+            error_types[type(e).__name__] = error_types.get(type(e).__name__, 0) + 1
+        requests_done += 1
+
+        if pause:
+            time.sleep(pause)
+
+    top_growth = []
+    if baseline_snapshot is not None:
+        top_growth = _format_stats(_filtered_snapshot().compare_to(baseline_snapshot, 'lineno'))
+    tracemalloc.stop()
+
+    # Szivárgás vizsgálat a bemelegítés utáni mintákon; túl kevés mintából
+    # nem lehet növekedést megállapítani, ilyenkor a futás nem értékelhető
+    steady = [s for s in samples if s['elapsed'] >= warmup]
+    inconclusive = len(steady) < MIN_STEADY_SAMPLES
+    leaks = [leak for leak in (
+        detect_growth(steady, 'rss_bytes', rss_threshold_mb * 1024 * 1024),
+        detect_growth(steady, 'traced_bytes', traced_threshold_mb * 1024 * 1024),
+        detect_growth(steady, 'open_fds', fd_threshold),
+    ) if leak is not None]
+
+    return {
+        'config': {
+            'duration': duration,
+            'interval': interval,
+            'warmup': warmup,
+            'pause': pause,
+            'rss_threshold_mb': rss_threshold_mb,
+            'traced_threshold_mb': traced_threshold_mb,
+            'fd_threshold': fd_threshold,
+            'request_timeout': request_timeout,
+            'workload': [name for name, _ in WORKLOAD],
+        },
+        'summary': {
+            'requests': requests_done,
+            'errors': errors,
+            'timeouts': timeouts,
+            'status_codes': status_codes,
+            'error_types': error_types,
+            'steady_samples': len(steady),
+            'inconclusive': inconclusive,
+            'passed': not leaks and not inconclusive,
+        },
+        'leaks': leaks,
+        'top_growth': top_growth,
+        'samples': samples,
+    }
+
+
+def parse_args(argv=None):
+    """Parancssori argumentumok"""
+    parser = argparse.ArgumentParser(description="TMDB API kliens soak teszt (memória és kapcsolat szivárgás)")
+    parser.add_argument('--duration', type=float, default=3600, help="futási idő másodpercben (alap: 3600)")
+    parser.add_argument('--interval', type=float, default=30, help="mintavételezési időköz másodpercben (alap: 30)")
+    parser.add_argument('--warmup', type=float, default=60, help="bemelegítési idő másodpercben (alap: 60)")
+    parser.add_argument('--pause', type=float, default=0.1, help="szünet két kérés között másodpercben (alap: 0.1)")
+    parser.add_argument('--rss-threshold-mb', type=float, default=50, help="megengedett RSS növekedés MB-ban (alap: 50)")
+    parser.add_argument('--traced-threshold-mb', type=float, default=20,
+                        help="megengedett tracemalloc növekedés MB-ban (alap: 20)")
+    parser.add_argument('--request-timeout', type=float, default=10,
+                        help="egy kérés timeout-ja másodpercben, a timeout hibának számít (alap: 10)")
+    parser.add_argument('--fd-threshold', type=int, default=20, help="megengedett fájlleíró növekedés (alap: 20)")
+    parser.add_argument('--metrics-port', type=int,
+                        help="ha meg van adva, élő OpenMetrics /metrics végpont ezen a porton")
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("az --interval értékének pozitívnak kell lennie")
+    # Mintavétel a 0., interval., 2*interval. ... másodpercben: a bemelegítés után
+    # legalább MIN_STEADY_SAMPLES mintának kell jutnia
+    if args.duration - args.warmup < (MIN_STEADY_SAMPLES - 1) * args.interval:
+        parser.error(
+            f"a bemelegítés után legalább {MIN_STEADY_SAMPLES} minta kell: "
+            f"--duration >= --warmup + {MIN_STEADY_SAMPLES - 1} * --interval"
+        )
+    return args
+
+
+def main(argv=None):
+    """Soak futtatás, JSON riport és dashboard készítése"""
+    args = parse_args(argv)
+
+    print("\n" + "="*60)
+    print("🧪 SOAK TESZT - memória és kapcsolat szivárgás")
+    print(f"Időtartam: {args.duration}s, mintavétel: {args.interval}s, bemelegítés: {args.warmup}s")
+    print("="*60 + "\n")
+
+    # Opcionális élő metrikák a futás alatt (Prometheus scrape)
+    metrics_server = None
+    if args.metrics_port:
+        collector = MetricsCollector()
+        collector.current_test = "soak"
+        collector.listen()
+        metrics_server = start_http_server(collector, args.metrics_port)
+        print(f"📈 Élő metrikák: http://127.0.0.1:{args.metrics_port}/metrics\n")
+
+    result = run_soak(
+        duration=args.duration,
+        interval=args.interval,
+        warmup=args.warmup,
+        pause=args.pause,
+        rss_threshold_mb=args.rss_threshold_mb,
+        traced_threshold_mb=args.traced_threshold_mb,
+        fd_threshold=args.fd_threshold,
+        request_timeout=args.request_timeout,
+    )
+
+    if metrics_server is not None:
+        metrics_server.shutdown()
+        collector.stop_listening()
+
+    reports_dir = os.path.join(get_project_root(), 'reports')
+    os.makedirs(reports_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_report = os.path.join(reports_dir, f'soak_{timestamp}.json')
+    with open(json_report, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+    print("\n" + "-"*60 + "\n")
+    print(f"📁 Soak JSON riport: {json_report}")
+    generate_soak_dashboard(json_report)
+
+    if result['summary']['inconclusive']:
+        print(f"\n⚠️ Nem értékelhető: a bemelegítés után csak {result['summary']['steady_samples']} minta készült "
+              f"(legalább {MIN_STEADY_SAMPLES} kell).")
+        return 2
+
+    if result['leaks']:
+        print("\n❌ Szivárgás gyanú:")
+        for leak in result['leaks']:
+            print(f"   • {leak['metric']}: +{leak['growth']:.0f} (küszöb: {leak['threshold']:.0f})")
+        return 1
+
+    print("\n✅ Nem volt a küszöböt meghaladó növekedés.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,16 +11,19 @@ Ez a script a központi orchestrator, ami "egy gombnyomásra" mindent elvégez:
 Használat:
     cd src
     python run_tests.py
+    python run_tests.py --compact   # kompakt dashboard (közös CSS/JS + JSON adat)
 
 A script exit code-dal tér vissza:
 - 0: minden teszt sikeres
 - 1: legalább egy teszt elbukott vagy hiba történt
 """
+import argparse
 import subprocess
 import os
 import sys
 from datetime import datetime
 from report_generator import generate_dashboard
+from metrics_exporter import export_report
 
 def print_header():
     """Fejléc kiírása"""
@@ -29,10 +32,13 @@ def print_header():
     print("TMDB API Automatizált Tesztelés")
     print("="*60 + "\n")
 
-def run_tests_with_reports():
+def run_tests_with_reports(compact=False):
     """
     Tesztek futtatása és riportok generálása
     
+    Args:
+        compact: kompakt dashboard generálása (lásd report_generator.generate_dashboard)
+    
     Lépések:
     1. pytest futtatás JSON és HTML riporttal
     2. Egyedi dashboard generálás
@@ -84,11 +90,21 @@ def run_tests_with_reports():
     try:
         generate_dashboard(
             json_filepath=json_report,
-            output_filepath=None  # Automatikus időbélyeges név, ../dashboard/ mappába
+            output_filepath=None,  # Automatikus időbélyeges név, ../dashboard/ mappába
+            compact=compact
         )
     except Exception as e:
         print(f"❌ HIBA a dashboard generálás során: {e}")
         return 1
+
+    # OpenMetrics export (node-exporter textfile collector)
+    # A fájlnév fix, hogy a collector mindig csak a legutolsó futást lássa
+    metrics_file = os.getenv('METRICS_TEXTFILE', '../reports/metrics.prom')
+    try:
+        export_report(json_report, metrics_file)
+    except Exception as e:
+        print(f"❌ HIBA a metrika export során: {e}")
+        return 1
     
     # Összegzés
     print("\n" + "="*60)
@@ -108,6 +124,7 @@ def run_tests_with_reports():
     print(f"   • pytest HTML: {html_report}")
     print(f"   • Egyedi dashboard: dashboard/dashboard_{timestamp}.html")
     print(f"   • JSON adat: {json_report}")
+    print(f"   • OpenMetrics: {metrics_file}")
     
     print("\nA részletes tesztriportok a böngészőben megtekinthetőek.")
     print("="*60 + "\n")
@@ -118,8 +135,13 @@ def run_tests_with_reports():
 # Ez fut le, amikor közvetlenül futtatjuk a scriptet
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API tesztek futtatása riportokkal és dashboarddal")
+    parser.add_argument('--compact', action='store_true',
+                        help="kompakt dashboard: közös CSS/JS (dashboard/assets/) + beágyazott JSON adat")
+    args = parser.parse_args()
+
     # Meghívjuk a fő függvényt és kapunk egy exit code-ot
-    exit_code = run_tests_with_reports()
+    exit_code = run_tests_with_reports(compact=args.compact)
 
     # Kilépünk ezzel az exit code-dal
     # Ezt a CI/CD rendszer (GitHub Actions) használja, hogy tudja, sikeres volt-e a teszt futás
@@ -19,7 +19,9 @@ from api_requests import (
     get_movie_details,
     search_movie,
     get_movie_genres,
-    get_with_custom_key
+    get_with_custom_key,
+    measure_body,
+    ResponseTooLarge
 )
 
 # --Funkcionális tesztek--
@@ -148,9 +150,14 @@ def test_tc17_response_time():
     assert elapsed < 2.0
 
 def test_tc18_response_size():
-    """TC18: JSON válasz mérete < 1 MB"""
-    response = get_popular_movies()
-    size_mb = len(response.content) / (1024 * 1024)
+    """TC18: JSON válasz mérete < 1 MB (streamelve, a törzs pufferelése nélkül)"""
+    response = get_popular_movies(stream=True)
+    try:
+        # 1 MB fölött az olvasás azonnal megszakad
+        sizes = measure_body(response, max_bytes=1024 * 1024)
+    except ResponseTooLarge as e:
+        pytest.fail(str(e))
+    size_mb = sizes["decoded_bytes"] / (1024 * 1024)
     assert size_mb < 1.0
 
 # Adat-integritás tesztek
@@ -0,0 +1,87 @@
+"""
+Hibainjektáló proxy tesztjei (fault_proxy, offline)
+
+A proxy upstreamje a conftest.py helyettesítő szervere (ugyanaz, mintha a
+FAULT_PROXY_UPSTREAM arra mutatna), így a tesztek TMDB nélkül futnak.
+"""
+
+import socket
+import time
+
+import pytest
+import requests
+from api_requests import get_popular_movies, get_with_custom_key, measure_body
+from fault_proxy import Scenario, fixed_latency
+
+
+@pytest.fixture(scope="module")
+def fault_proxy_upstream(stand_in_server):
+    """A proxy a helyettesítő szerverre továbbít"""
+    return stand_in_server
+
+
+def test_passthrough(faults):
+    """Hibamentes forgatókönyv: a válasz változatlanul átjön"""
+    response = get_popular_movies()
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 20
+    assert faults.stats["requests"] == 1
+    assert faults.stats["upstream_errors"] == 0
+
+@pytest.mark.fault_scenario(latency=fixed_latency(0.3))
+def test_latency(faults):
+    """Injektált késleltetés markerrel"""
+    start = time.time()
+    response = get_popular_movies()
+    assert response.status_code == 200
+    assert time.time() - start >= 0.3
+    assert faults.stats["delayed"] == 1
+
+def test_error_burst(faults):
+    """Periodikus 429 sorozat Retry-After fejléccel"""
+    faults.scenario = Scenario(burst=(429, 2, 4))
+    responses = [get_popular_movies() for _ in range(5)]
+    assert [r.status_code for r in responses] == [429, 429, 200, 200, 429]
+    assert responses[0].headers["Retry-After"] == "1"
+    assert faults.stats["errors"] == 3
+
+@pytest.mark.fault_scenario(error_rate=1.0, error_status=[500, 503], seed=7)
+def test_random_errors(faults):
+    """Véletlen 5xx hibák a megadott kódokból"""
+    statuses = {get_popular_movies().status_code for _ in range(10)}
+    assert statuses <= {500, 503}
+
+@pytest.mark.fault_scenario(reset_rate=1.0)
+def test_connection_reset(faults):
+    """Kapcsolat bontás: a kliens ConnectionError-t kap"""
+    with pytest.raises(requests.exceptions.ConnectionError):
+        get_popular_movies()
+    assert faults.stats["resets"] >= 1
+
+@pytest.mark.fault_scenario(truncate_rate=1.0)
+def test_truncated_body(faults):
+    """Csonkolt törzs: a kliens a hiányzó bájtokat észleli"""
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        get_with_custom_key("movie/popular", count=500, gzip=0)
+    assert faults.stats["truncated"] == 1
+
+@pytest.mark.fault_scenario(bandwidth=20000)
+def test_bandwidth_limit(faults):
+    """Sávszélesség korlát: ~25 KB 20 KB/s mellett legalább ~1 másodperc"""
+    start = time.time()
+    response = get_with_custom_key("movie/popular", count=500, gzip=0)
+    assert response.status_code == 200
+    assert len(response.content) > 20000
+    assert time.time() - start >= 0.9
+
+def test_stream_chunked_upstream(faults):
+    """Chunked upstream válasz streamelve a proxyn át: a méretek helyesek"""
+    sizes = measure_body(get_with_custom_key("movie/popular", stream=True, count=3000, chunked=1))
+    assert 0 < sizes["wire_bytes"] < sizes["decoded_bytes"]
+
+def test_malformed_request(faults):
+    """Hibás kérés sor: 400 válasz, a proxy tovább működik"""
+    with socket.create_connection((faults.host, faults.port), timeout=5) as sock:
+        sock.sendall(b"GARBAGE\r\n\r\n")
+        assert sock.recv(1024).startswith(b"HTTP/1.1 400")
+    assert get_popular_movies().status_code == 200
@@ -0,0 +1,176 @@
+"""
+OpenMetrics exporter tesztjei (metrics_exporter, offline)
+
+Szintetikus pytest JSON riportból dolgoznak; az élő gyűjtés tesztje a
+conftest.py helyettesítő szerverét használja, így TMDB nélkül futnak.
+"""
+
+import os
+
+import pytest
+import requests
+import metrics_exporter
+from api_requests import get_popular_movies, measure_body
+from metrics_exporter import MetricsCollector, _escape, start_http_server, write_textfile
+
+
+REPORT = {
+    "tests": [
+        {
+            "nodeid": "test_cases.py::test_tc01_popular_movies",
+            "outcome": "passed",
+            "call": {"duration": 0.1},  # pontosan egy bucket határ
+            "metadata": {"http_requests": [
+                {"endpoint": "/movie/popular", "method": "GET", "status": 200, "elapsed": 0.05, "bytes": 1200},
+                {"endpoint": "/movie/popular", "method": "GET", "status": 200, "elapsed": 0.3, "bytes": None},
+                {"endpoint": "/movie/popular", "method": "GET", "status": 200, "elapsed": 7.0, "bytes": 3400},
+            ]},
+        },
+        {
+            "nodeid": "test_cases.py::test_tc07_invalid_api_key",
+            "outcome": "failed",
+            "call": {"duration": 0.7},
+            "metadata": {"http_requests": [
+                {"endpoint": "/movie/popular", "method": "GET", "status": 401, "elapsed": 0.025, "bytes": 80},
+                {"endpoint": "/genre/movie/list", "method": "GET", "status": 401, "elapsed": 0.2, "bytes": 90},
+            ]},
+        },
+        {
+            "nodeid": "test_cases.py::test_tc99_skipped",
+            "outcome": "skipped",
+            "metadata": {},
+        },
+    ]
+}
+
+
+@pytest.fixture
+def collector():
+    collector = MetricsCollector()
+    collector.add_report(REPORT)
+    return collector
+
+def _samples(text, name):
+    """Egy metrika mintasorai {címkék: érték} formában"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith(name + "{"):
+            labels, value = line[len(name) + 1:].rsplit("} ", 1)
+            samples[labels] = value
+    return samples
+
+
+def test_add_report_test_results(collector):
+    """Tesztenként egy eredmény, az endpoint címke a teszt kéréseiből"""
+    results = _samples(collector.render(), "api_test_results_total")
+    assert results == {
+        'test="test_tc01_popular_movies",endpoint="/movie/popular",outcome="passed"': "1",
+        'test="test_tc07_invalid_api_key",endpoint="/genre/movie/list,/movie/popular",outcome="failed"': "1",
+        'test="test_tc99_skipped",endpoint="",outcome="skipped"': "1",
+    }
+
+def test_counter_family_naming(collector):
+    """OpenMetrics: a család neve _total nélküli és # EOF zárja; Prometheus: _total, # EOF nélkül"""
+    openmetrics = collector.render(openmetrics=True)
+    assert "# TYPE api_test_results counter" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+    prometheus = collector.render(openmetrics=False)
+    assert "# TYPE api_test_results_total counter" in prometheus
+    assert "# EOF" not in prometheus
+    # a mintasorok neve mindkét formátumban _total
+    assert _samples(openmetrics, "api_test_results_total") == _samples(prometheus, "api_test_results_total")
+
+def test_histogram_buckets_cumulative(collector):
+    """Kumulatív bucketek; a határral egyenlő érték abba a le-be esik"""
+    text = collector.render()
+    labels = 'test="test_tc01_popular_movies",endpoint="/movie/popular",code="200"'
+    buckets = {
+        key.rsplit('le="', 1)[1].rstrip('"'): int(value)
+        for key, value in _samples(text, "api_http_request_duration_seconds_bucket").items()
+        if key.startswith(labels + ",")
+    }
+    # elapsed: 0.05 (== határ), 0.3, 7.0 (csak +Inf)
+    assert buckets == {"0.025": 0, "0.05": 1, "0.1": 1, "0.25": 1, "0.5": 2, "1.0": 2, "2.0": 2, "5.0": 2, "+Inf": 3}
+    assert _samples(text, "api_http_request_duration_seconds_count")[labels] == "3"
+    assert float(_samples(text, "api_http_request_duration_seconds_sum")[labels]) == pytest.approx(7.35)
+
+    durations = _samples(text, "api_test_duration_seconds_bucket")
+    assert durations['test="test_tc01_popular_movies",endpoint="/movie/popular",le="0.05"'] == "0"
+    assert durations['test="test_tc01_popular_movies",endpoint="/movie/popular",le="0.1"'] == "1"
+
+def test_status_code_label(collector):
+    """A státuszkód külön hisztogramot kap"""
+    counts = _samples(collector.render(), "api_http_request_duration_seconds_count")
+    assert counts['test="test_tc07_invalid_api_key",endpoint="/movie/popular",code="401"'] == "1"
+    assert counts['test="test_tc07_invalid_api_key",endpoint="/genre/movie/list",code="401"'] == "1"
+
+def test_response_size_is_max_and_skips_unknown(collector):
+    """A legnagyobb ismert méret kerül ki; a None (nem mért) méret kimarad"""
+    sizes = _samples(collector.render(), "api_http_response_size_bytes")
+    assert sizes == {
+        'test="test_tc01_popular_movies",endpoint="/movie/popular"': "3400",
+        'test="test_tc07_invalid_api_key",endpoint="/movie/popular"': "80",
+        'test="test_tc07_invalid_api_key",endpoint="/genre/movie/list"': "90",
+    }
+
+def test_label_escaping():
+    """A címke értékekben a \\, " és a sortörés escape-elve jelenik meg"""
+    assert _escape('a\\b"c\nd') == 'a\\\\b\\"c\\nd'
+    collector = MetricsCollector()
+    collector.observe_test('test_x[a"b\\c\nd]', "passed", 0.01)
+    line = next(line for line in collector.render().splitlines() if line.startswith("api_test_results_total{"))
+    assert line == 'api_test_results_total{test="test_x[a\\"b\\\\c\\nd]",endpoint="",outcome="passed"} 1'
+
+def test_write_textfile_atomic(collector, tmp_path, monkeypatch):
+    """Teljes tartalom, ideiglenes fájl nélkül; sikertelen cserénél a régi fájl marad"""
+    output = tmp_path / "api_tests.prom"
+    output.write_text("régi tartalom\n", encoding="utf-8")
+
+    write_textfile(collector, str(output))
+    assert output.read_text(encoding="utf-8") == collector.render(openmetrics=False)
+    assert os.listdir(tmp_path) == ["api_tests.prom"]
+
+    replaced = []
+    def failing_replace(src, dst):
+        replaced.append((src, dst))
+        raise OSError("csere sikertelen")
+    monkeypatch.setattr(metrics_exporter.os, "replace", failing_replace)
+    collector.observe_test("test_new", "passed", 0.2)
+    with pytest.raises(OSError):
+        write_textfile(collector, str(output))
+    # az ideiglenes fájl a célfájl mappájában készül, így a csere atomikus
+    assert os.path.dirname(replaced[0][0]) == str(tmp_path)
+    assert "test_new" not in output.read_text(encoding="utf-8")
+
+def test_metrics_http_endpoint(collector):
+    """/metrics: formátum az Accept fejléc alapján, más útvonalon 404"""
+    server = start_http_server(collector, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        response = requests.get(url + "/metrics", headers={"Accept": "application/openmetrics-text"})
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == metrics_exporter.OPENMETRICS_CONTENT_TYPE
+        assert response.text == collector.render(openmetrics=True)
+
+        response = requests.get(url + "/metrics")
+        assert response.headers["Content-Type"] == metrics_exporter.PROMETHEUS_CONTENT_TYPE
+        assert response.text == collector.render(openmetrics=False)
+
+        assert requests.get(url + "/other").status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_live_collection(stand_in_api):
+    """Élő gyűjtés az api_requests megfigyelőjén keresztül a current_test címkével"""
+    collector = MetricsCollector()
+    collector.current_test = "soak"
+    collector.listen()
+    try:
+        get_popular_movies()
+        measure_body(get_popular_movies(stream=True))
+    finally:
+        collector.stop_listening()
+    counts = _samples(collector.render(), "api_http_request_duration_seconds_count")
+    assert counts == {'test="soak",endpoint="/movie/popular",code="200"': "2"}
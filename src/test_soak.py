@@ -0,0 +1,110 @@
+"""
+Soak mód tesztjei (run_soak, offline)
+
+A rövid soak futások a conftest.py helyettesítő szerverén (vagy az elé
+tett hibainjektáló proxyn) futnak, TMDB nélkül.
+"""
+
+import pytest
+import requests
+from api_requests import measure_body
+from fault_proxy import fixed_latency
+from run_soak import detect_growth, get_pool_stats, parse_args, run_soak
+
+
+@pytest.fixture(scope="module")
+def fault_proxy_upstream(stand_in_server):
+    """A proxy a helyettesítő szerverre továbbít"""
+    return stand_in_server
+
+
+def _series(metric, values):
+    """Szintetikus mintasor egy metrikára"""
+    return [{'elapsed': i * 30.0, metric: value} for i, value in enumerate(values)]
+
+
+def test_detect_growth_steady_growth():
+    """Folyamatos növekedés a küszöb fölött: szivárgás"""
+    leak = detect_growth(_series('rss_bytes', [100 + 10 * i for i in range(12)]), 'rss_bytes', 50)
+    assert leak == {'metric': 'rss_bytes', 'growth': 80, 'threshold': 50, 'first': 100, 'last': 210}
+
+def test_detect_growth_below_threshold():
+    """Küszöb alatti (vagy azzal egyenlő) növekedés nem szivárgás"""
+    assert detect_growth(_series('open_fds', [10, 11, 12, 13, 14, 15]), 'open_fds', 20) is None
+    assert detect_growth(_series('open_fds', [10, 10, 10, 30, 30, 30]), 'open_fds', 20) is None
+
+def test_detect_growth_ignores_spikes_and_drops():
+    """Egyszeri kiugrás és csökkenés nem okoz riasztást (harmadok mediánja)"""
+    assert detect_growth(_series('rss_bytes', [100, 100, 5000, 100, 100, 100, 100, 100, 100]), 'rss_bytes', 50) is None
+    assert detect_growth(_series('rss_bytes', [500, 450, 400, 350, 300, 250]), 'rss_bytes', 0) is None
+
+def test_detect_growth_skips_unmeasured_values():
+    """A nem mérhető (None) értékek kimaradnak; 3-nál kevesebb értékből nincs ítélet"""
+    samples = _series('open_fds', [None, 10, None, 100])
+    assert detect_growth(samples, 'open_fds', 5) is None
+    samples += _series('open_fds', [200])
+    assert detect_growth(samples, 'open_fds', 5)['growth'] == 190
+
+def test_get_pool_stats(stand_in_server):
+    """Kiolvasott válasz után a kapcsolat visszakerül a poolba (idle), streamelt, nyitott válasznál nem"""
+    session = requests.Session()
+    assert get_pool_stats(session) == {'pools': 0, 'connections': 0, 'idle_connections': 0}
+    session.get(stand_in_server + "/3/movie/popular")
+    session.get(stand_in_server + "/3/genre/movie/list")
+    assert get_pool_stats(session) == {'pools': 1, 'connections': 1, 'idle_connections': 1}
+
+    response = session.get(stand_in_server + "/3/movie/popular", stream=True)
+    assert get_pool_stats(session)['idle_connections'] == 0
+    measure_body(response)
+    session.close()
+
+@pytest.mark.parametrize("argv", [
+    ["--duration", "60", "--warmup", "60", "--interval", "30"],
+    ["--duration", "100", "--warmup", "60", "--interval", "30"],
+    ["--duration", "60", "--warmup", "0", "--interval", "0"],
+])
+def test_parse_args_rejects_too_few_steady_samples(argv):
+    """Olyan beállítás, ahol a bemelegítés után 3-nál kevesebb minta lenne, hibát ad"""
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+def test_parse_args_accepts_minimal_config():
+    args = parse_args(["--duration", "120", "--warmup", "60", "--interval", "30"])
+    assert (args.duration, args.warmup, args.interval) == (120, 60, 30)
+
+def _short_soak(**kwargs):
+    """Rövid soak futás tág küszöbökkel"""
+    params = dict(duration=1.0, interval=0.25, warmup=0.25, pause=0,
+                  rss_threshold_mb=500, traced_threshold_mb=500, fd_threshold=1000)
+    params.update(kwargs)
+    return run_soak(**params)
+
+
+@pytest.mark.fault_scenario(latency=fixed_latency(2.0))
+def test_hung_requests_time_out(faults):
+    """Beragadt kérések: timeout hibaként számolva, a mintavételezés folytatódik"""
+    result = _short_soak(request_timeout=0.2)
+    summary = result["summary"]
+    assert summary["requests"] > 0
+    assert summary["timeouts"] == summary["errors"] == summary["requests"]
+    assert len(result["samples"]) >= 4
+
+def test_short_soak_run(stand_in_api):
+    """Rövid soak a helyettesítő szerveren: hibamentes, értékelhető, nincs szivárgás"""
+    result = _short_soak()
+    summary = result["summary"]
+    assert summary["requests"] > 0
+    assert summary["errors"] == 0
+    assert summary["status_codes"] == {"200": summary["requests"]}
+    assert summary["steady_samples"] >= 3
+    assert not summary["inconclusive"]
+    assert summary["passed"] and result["leaks"] == []
+    # a közös session az első kérések után nem nyit újabb kapcsolatot
+    assert result["samples"][-1]["connections"] == result["samples"][1]["connections"]
+
+def test_short_soak_inconclusive(stand_in_api):
+    """Túl kevés bemelegítés utáni minta: nem értékelhető, és nem is sikeres"""
+    result = _short_soak(duration=0.5, warmup=0.5)
+    assert result["summary"]["steady_samples"] < 3
+    assert result["summary"]["inconclusive"]
+    assert not result["summary"]["passed"]
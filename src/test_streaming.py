@@ -0,0 +1,151 @@
+"""
+Streaming válaszkezelés tesztjei (api_requests, offline)
+
+A tesztek a conftest.py helyettesítő szerverén futnak (stand_in_api fixture),
+TMDB API kulcs és hálózat nélkül.
+"""
+
+import gzip
+import json
+import random
+import zlib
+
+import pytest
+import api_requests
+from api_requests import (
+    get_popular_movies,
+    get_with_custom_key,
+    iter_results,
+    measure_body,
+    ResponseTooLarge
+)
+from api_requests import _iter_json_array, _JsonStream
+
+
+def _expected_body(count):
+    """A helyettesítő szerver által küldött JSON törzs"""
+    return json.dumps({
+        "page": 1,
+        "results": [{"id": i, "title": f"Movie {i}", "release_date": None} for i in range(count)],
+        "total_results": count,
+    }).encode("utf-8")
+
+
+def test_measure_body_gzip_content_length(stand_in_api):
+    """Content-Length + gzip: a wire méret a tömörített, a dekódolt a teljes törzs"""
+    body = _expected_body(3000)
+    sizes = measure_body(get_with_custom_key("movie/popular", stream=True, count=3000))
+    assert sizes["decoded_bytes"] == len(body)
+    assert sizes["wire_bytes"] == len(gzip.compress(body, mtime=0))
+
+def test_measure_body_gzip_chunked(stand_in_api):
+    """Chunked + gzip: a wire méret akkor is mérhető, ha nincs Content-Length"""
+    body = _expected_body(3000)
+    sizes = measure_body(get_with_custom_key("movie/popular", stream=True, count=3000, chunked=1))
+    assert sizes["decoded_bytes"] == len(body)
+    assert sizes["wire_bytes"] == len(gzip.compress(body, mtime=0))
+
+def test_measure_body_uncompressed_chunked(stand_in_api):
+    """Tömörítés nélkül a wire és a dekódolt méret megegyezik"""
+    sizes = measure_body(get_with_custom_key("movie/popular", stream=True, count=500, chunked=1, gzip=0))
+    assert sizes["wire_bytes"] == sizes["decoded_bytes"] == len(_expected_body(500))
+
+@pytest.mark.parametrize("deflate, wbits", [("zlib", zlib.MAX_WBITS), ("raw", -zlib.MAX_WBITS)])
+def test_measure_body_deflate(stand_in_api, deflate, wbits):
+    """deflate: zlib fejléccel és nyers deflate-ként is kicsomagolódik (mint a urllib3-ban)"""
+    body = _expected_body(3000)
+    compressor = zlib.compressobj(wbits=wbits)
+    response = get_with_custom_key("movie/popular", stream=True, count=3000, chunked=1, deflate=deflate)
+    sizes = measure_body(response)
+    assert sizes["decoded_bytes"] == len(body)
+    assert sizes["wire_bytes"] == len(compressor.compress(body) + compressor.flush())
+    response = get_with_custom_key("movie/popular", stream=True, count=300, deflate=deflate)
+    assert [movie["id"] for movie in iter_results(response)] == list(range(300))
+
+def test_max_bytes_aborts_chunked_gzip(stand_in_api):
+    """A méretkorlát a dekódolt oldalon is érvényesül (gzip mellett is)"""
+    response = get_with_custom_key("movie/popular", stream=True, count=5000, chunked=1)
+    with pytest.raises(ResponseTooLarge):
+        measure_body(response, max_bytes=10 * 1024)
+    assert response.decoded_bytes < len(_expected_body(5000))
+
+def test_iter_results_chunked_gzip(stand_in_api):
+    """A results elemei egyesével, sorrendben érkeznek"""
+    response = get_with_custom_key("movie/popular", stream=True, count=2000, chunked=1)
+    ids = [movie["id"] for movie in iter_results(response)]
+    assert ids == list(range(2000))
+
+def test_stream_flag_not_sent_as_query(stand_in_api):
+    """A stream paraméter nem kerül a query stringbe"""
+    response = get_with_custom_key("movie/popular", stream=True)
+    assert "stream" not in response.request.url
+    assert measure_body(response)["decoded_bytes"] > 0
+
+def test_popular_movies_stream(stand_in_api):
+    """A TC18-ban használt hívás: get_popular_movies(stream=True)"""
+    sizes = measure_body(get_popular_movies(stream=True), max_bytes=1024 * 1024)
+    assert 0 < sizes["wire_bytes"] < sizes["decoded_bytes"]
+
+def test_streamed_size_recorded(stand_in_api):
+    """A kérés rekord a streamelt törzs végigolvasása után megkapja a méreteket"""
+    records = []
+    api_requests.add_request_listener(records.append)
+    try:
+        sizes = measure_body(get_with_custom_key("movie/popular", stream=True, count=1000, chunked=1))
+    finally:
+        api_requests.remove_request_listener(records.append)
+    assert records[0]["bytes"] == sizes["decoded_bytes"]
+    assert records[0]["wire_bytes"] == sizes["wire_bytes"]
+
+
+def _parse_chunks(chunks, key="results"):
+    """Az inkrementális parser futtatása szöveg-darabokon"""
+    return list(_iter_json_array(_JsonStream(iter(chunks)), key))
+
+def _random_chunks(text, max_size, seed=0):
+    """A szöveg véletlen (1..max_size) hosszú darabokra vágva"""
+    rng = random.Random(seed)
+    chunks, pos = [], 0
+    while pos < len(text):
+        size = rng.randint(1, max_size)
+        chunks.append(text[pos:pos + size])
+        pos += size
+    return chunks
+
+@pytest.mark.parametrize("chunks, expected", [
+    (['{"results":[7.', '5]}'], [7.5]),
+    (['{"page":1.', '0, "results":[1]}'], [1]),
+    (['{"results":[1e', '5, -2', '.5E-', '3]}'], [1e5, -2.5e-3]),
+    (['{"results":[12', '3', ']}'], [123]),
+])
+def test_json_number_split_at_chunk_boundary(chunks, expected):
+    """A darabhatáron kettévágott szám (pont, kitevő után is) egyben dekódolódik"""
+    assert _parse_chunks(chunks) == expected
+
+@pytest.mark.parametrize("max_size", [1, 2, 3, 7, 64])
+def test_json_random_chunk_sizes(max_size):
+    """Tetszőleges darabolásnál ugyanaz az eredmény, mint a json.loads-nál"""
+    document = {
+        "page": 1.5,
+        "meta": {"note": 'idéző " és \\ jel, [ { } ]', "values": [1e-7, -0.0, 3E+2, True, None]},
+        "flag": False,
+        "ratio": -12.75e3,
+        "results": [
+            {"id": i, "vote_average": i / 7, "popularity": i * 1.5e10, "title": f'Movie "{i}" \\'}
+            for i in range(50)
+        ] + [0.1, -1e-9, "x", [], {}],
+        "total_results": 55,
+    }
+    text = json.dumps(document, ensure_ascii=False)
+    for seed in range(5):
+        assert _parse_chunks(_random_chunks(text, max_size, seed)) == document["results"]
+
+def test_json_large_sibling_is_skipped_without_buffering():
+    """A results előtti nagy érték átugrásakor a puffer nem nő a darabméret fölé"""
+    large = json.dumps({"cast": [{"name": f"Actor {i}", "bio": "x\\\"y" * 20} for i in range(20000)]})
+    text = '{"credits": ' + large + ', "results": [1, 2]}'
+    stream = _JsonStream(iter(_random_chunks(text, 4096)))
+    items = _iter_json_array(stream, "results")
+    assert next(items) == 1
+    assert len(stream._buffer) < 2 * 4096
+    assert list(items) == [2]